@@ -1,13 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import os
 import uuid
+import zipfile
 from concurrent.futures import ThreadPoolExecutor
-import os
 from io import BytesIO
 from pathlib import Path
 from typing import Annotated
 from urllib.parse import urlparse, urlunparse
-import zipfile
 
 import fitz
 from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile, status
@@ -189,7 +190,9 @@ async def create_chapter(
         suffix = Path(file.filename or f"page_{index}.png").suffix.lower() or ".png"
 
         if suffix in ARCHIVE_EXTENSIONS:
-            extracted = _extract_archive_images(
+            # Decoding/rendering pages is CPU-bound; keep it off the event loop
+            extracted = await asyncio.to_thread(
+                _extract_archive_images,
                 chapter_id,
                 page_index,
                 content,
@@ -201,7 +204,8 @@ async def create_chapter(
             continue
 
         if suffix in PDF_EXTENSIONS:
-            extracted = _extract_pdf_images(
+            extracted = await asyncio.to_thread(
+                _extract_pdf_images,
                 chapter_id,
                 page_index,
                 content,
@@ -212,7 +216,8 @@ async def create_chapter(
             page_index += len(extracted)
             continue
 
-        saved = _persist_image_bytes(
+        saved = await asyncio.to_thread(
+            _persist_image_bytes,
             chapter_id,
             page_index,
             suffix,
@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Path
 
 from app.models.schemas import SpeakerUpdate
 from app.services.pipeline import chapter_store
+from app.workers.tasks import enqueue_speaker_job
 
 router = APIRouter()
 
@@ -13,6 +14,9 @@ async def update_speaker(
 ) -> dict[str, str]:
     if payload is None:
         raise HTTPException(status_code=400, detail="Missing payload")
-    chapter_store.update_speaker(speaker_id, payload)
+    if chapter_store.update_speaker(speaker_id, payload):
+        # TTS runs in the worker so the request never waits on the provider
+        job_id = enqueue_speaker_job(speaker_id, payload.voice_id)
+        return {"status": "queued", "job_id": job_id}
     return {"status": "ok"}
 
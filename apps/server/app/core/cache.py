@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Mapping
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ReplyCache:
+    """Exact-match cache of provider replies in Redis, keyed by a hash of the request.
+
+    The cache is best-effort: any Redis error disables it for the rest of the
+    process. A TTL of 0 disables it outright.
+    """
+
+    def __init__(self, prefix: str, ttl_seconds: int, name: str) -> None:
+        self._prefix = prefix
+        self._ttl = ttl_seconds
+        self._name = name
+        self._client: Redis | None = None
+        self._disabled = ttl_seconds <= 0
+
+    def key(self, *parts: str | int | float | None) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return self._prefix + digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        client = self._redis()
+        if client is None:
+            return None
+        try:
+            return client.get(key)
+        except RedisError as exc:
+            self._disable(exc)
+            return None
+
+    def set(self, key: str, text: str | bytes) -> None:
+        self.set_many({key: text})
+
+    def get_many(self, keys: list[str]) -> list[str | None]:
+        client = self._redis()
+        if client is None or not keys:
+            return [None] * len(keys)
+        try:
+            return client.mget(keys)
+        except RedisError as exc:
+            self._disable(exc)
+            return [None] * len(keys)
+
+    def set_many(self, replies: Mapping[str, str | bytes]) -> None:
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            with client.pipeline(transaction=False) as pipe:
+                for key, text in replies.items():
+                    if text:
+                        pipe.set(key, text, ex=self._ttl)
+                pipe.execute()
+        except RedisError as exc:
+            self._disable(exc)
+
+    def _redis(self) -> Redis | None:
+        if self._disabled:
+            return None
+        if self._client is None:
+            self._client = Redis.from_url(
+                settings.redis_url, decode_responses=True, socket_timeout=1.0
+            )
+        return self._client
+
+    def _disable(self, exc: Exception) -> None:
+        self._disabled = True
+        logger.warning("⚠️ %s cache disabled: %s", self._name, exc)
@@ -30,7 +30,19 @@ class Settings(BaseSettings):
     force_https_assets: bool = True
     enable_local_detector: bool = True
     vision_single_pass: bool = False
+    vision_combined_slices: bool = True
+    vision_request_metadata: bool = False
+    vision_stream_responses: bool = True
+    vision_image_format: str = "jpeg"
+    vision_max_dim: int = 1536
+    max_image_pixels: int = 300_000_000
+    openai_vision_rpm: int = 500
+    openai_vision_tpm: int = 200_000
+    openai_max_attempts: int = 4
+    vision_reply_cache_ttl: int = 7 * 24 * 3600
+    tts_clip_cache_ttl: int = 7 * 24 * 3600
     job_timeout_seconds: int = 900
+    log_level: str = "INFO"
 
 
 @lru_cache(maxsize=1)
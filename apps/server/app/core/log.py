@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import logging.handlers
+import queue
+
+from app.core.config import settings
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def configure_logging() -> None:
+    """Route app logs through a queue so formatting and I/O happen on one thread."""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(settings.log_level.upper())
+    app_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    app_logger.propagate = False
@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import logging
 from typing import BinaryIO
 from urllib.parse import urlparse, urlunparse
 
 import boto3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.core.config import settings
 
+try:  # Optional dependency; SIMD base64 for data URL fallbacks of whole audio clips, encoded straight to str
+    from pybase64 import b64encode_as_string as _b64encode_str  # type: ignore
+except Exception:  # pragma: no cover - optional import
+    from base64 import b64encode as _b64encode
+
+    def _b64encode_str(data: bytes | memoryview) -> str:
+        return _b64encode(data).decode("ascii")
+
+
+logger = logging.getLogger(__name__)
+
+
+def _data_url(data: bytes, content_type: str) -> str:
+    return f"data:{content_type};base64,{_b64encode_str(data)}"
+
 
 class StorageClient:
     def __init__(self) -> None:
@@ -15,7 +33,24 @@ class StorageClient:
         self._is_supabase = "supabase.co" in endpoint
         if self._is_supabase:
             self._client = None
+            # Keep-alive pool for the per-clip uploads; the adapter only retries
+            # failed connection setup, not uploads that were already sent
             self._session = requests.Session()
+            self._session.mount(
+                "https://",
+                HTTPAdapter(
+                    pool_maxsize=8,
+                    max_retries=Retry(
+                        total=2,
+                        connect=2,
+                        read=0,
+                        status=0,
+                        other=0,
+                        backoff_factor=0.3,
+                        allowed_methods=None,
+                    ),
+                ),
+            )
         else:
             self._client = boto3.client(
                 "s3",
@@ -56,12 +91,9 @@ class StorageClient:
             url = f"{settings.s3_endpoint}/{self._bucket}/{key}"
             return self._normalize_url(url)
         except Exception as e:
-            print(f"❌ Storage upload failed: {type(e).__name__}: {str(e)}")
+            logger.error("❌ Storage upload failed: %s: %s", type(e).__name__, e)
             # Return a data URL as fallback
-            import base64
-
-            encoded = base64.b64encode(data).decode()
-            return f"data:{content_type};base64,{encoded}"
+            return _data_url(data, content_type)
 
     def _supabase_put_bytes(self, key: str, data: bytes, content_type: str) -> str:
         endpoint = settings.s3_endpoint.rstrip("/")
@@ -75,13 +107,8 @@ class StorageClient:
         try:
             response.raise_for_status()
         except Exception as exc:
-            print(
-                f"❌ Supabase storage upload failed: {type(exc).__name__}: {str(exc)}"
-            )
-            import base64
-
-            encoded = base64.b64encode(data).decode()
-            return f"data:{content_type};base64,{encoded}"
+            logger.error("❌ Supabase storage upload failed: %s: %s", type(exc).__name__, exc)
+            return _data_url(data, content_type)
 
         # make asset publicly accessible
         url = f"{endpoint}/object/public/{self._bucket}/{key}"
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -7,8 +8,17 @@ from fastapi.staticfiles import StaticFiles
 
 from app.api.routes import bubbles, chapters, jobs, speakers
 from app.core.config import settings
+from app.core.log import configure_logging
+from app.services.tts import tts_service
 
-app = FastAPI(title="Inkami API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    configure_logging()
+    yield
+
+
+app = FastAPI(title="Inkami API", version="0.1.0", lifespan=lifespan)
 
 def _add_origin_variants(raw: str, bucket: set[str]) -> None:
     cleaned = raw.strip().rstrip("/")
@@ -65,7 +75,6 @@ async def health() -> dict[str, str]:
 @app.get("/api/voices", tags=["meta"])
 async def get_voices() -> dict[str, str]:
     """Get available voice IDs and their display names."""
-    from app.services.tts import tts_service
     return tts_service.VOICE_DISPLAY_NAMES
 
 
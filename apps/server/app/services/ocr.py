@@ -1,19 +1,43 @@
 from __future__ import annotations
 
+import logging
+import re
+import string
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
-import re
 from typing import List, Sequence
 
-from PIL import Image, ImageEnhance, ImageOps
 import pytesseract
+from PIL import Image, ImageEnhance, ImageOps
 from pytesseract import Output
 
 from app.models.schemas import BubbleType
 
+logger = logging.getLogger(__name__)
+
+_PANEL_ALLOWED = " ?!.,;:-'\""
+# Deleting every allowed ASCII character leaves only the junk, counted in C
+_PANEL_ALLOWED_DELETE = str.maketrans("", "", string.ascii_letters + string.digits + _PANEL_ALLOWED)
+
+
+_DATA_WORD_JUNK_RE = re.compile(r"[^A-Za-z0-9'\"-]+")
+_LINE_BREAKS_RE = re.compile(r"[\r\n]+")
+_UI_JUNK_RE = re.compile(r"[^A-Za-z0-9'\"?!., ]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+# Deleting every non-letter ASCII character leaves only the letters
+_ASCII_NON_ALPHA_DELETE = str.maketrans(
+    "", "", "".join(char for char in map(chr, range(128)) if not char.isalpha())
+)
 
-@dataclass
+
+def _panel_junk_count(text: str) -> int:
+    if text.isascii():
+        return len(text.translate(_PANEL_ALLOWED_DELETE))
+    return sum(1 for char in text if not char.isalnum() and char not in _PANEL_ALLOWED)
+
+
+@dataclass(slots=True)
 class DetectedBubble:
     bubble_id: str
     box: Sequence[float]
@@ -24,7 +48,12 @@ class DetectedBubble:
 
 
 class OCRService:
-    UI_KEYWORDS = ["YOU", "ARE", "CHARACTER", "SYSTEM", "QUEST", "MISSION", "STATUS", "KNIGHT", "BLOOD", "IRON"]
+    UI_KEYWORDS = ("YOU", "ARE", "CHARACTER", "SYSTEM", "QUEST", "MISSION", "STATUS", "KNIGHT", "BLOOD", "IRON")
+    PANEL_KEYWORDS = ("YOU ARE", "CHARACTER", "SYSTEM", "QUEST", "MISSION", "STATUS")
+    PANEL_KEYWORDS_RE = re.compile("|".join(map(re.escape, PANEL_KEYWORDS)))
+    GIBBERISH_MARKERS = ("\\", "|", "Ny", "Qe", "Oy", "Ap", "Ay")
+    GIBBERISH_RE = re.compile("|".join(map(re.escape, GIBBERISH_MARKERS)))
+    KNIGHT_TITLE_KEYWORDS = ("YOU", "ARE", "NOW", "CHARACTER", "KNIGHT", "BLOOD", "IRON")
 
     def extract(self, image_path: Path, box: Sequence[float]) -> str:
         image = Image.open(image_path).convert("RGB")
@@ -169,11 +198,9 @@ class OCRService:
                 top = scored[0]
                 return self._normalize_ui_text(top)
             except Exception as e:
-                print(f"⚠️ UI OCR failed for region {region}: {e}")
+                logger.warning("⚠️ UI OCR failed for region %s: %s", region, e)
                 return ""
         
-        ui_keywords = ["YOU ARE", "CHARACTER", "SYSTEM", "QUEST", "MISSION", "STATUS"]
-        
         # Focused region on the right side where panels usually appear
         panel_region = (
             int(width * 0.45),
@@ -181,14 +208,15 @@ class OCRService:
             int(width * 0.95),
             int(height * 0.75),
         )
-        print(f"🔎 Scanning panel region: {panel_region} on {width}x{height} image")
+        logger.debug("🔎 Scanning panel region: %s on %dx%d image", panel_region, width, height)
         panel_text = _extract_text_from_region(panel_region)
-        print(f"🔎 Panel OCR result: '{panel_text}' (length: {len(panel_text)})")
+        logger.debug("🔎 Panel OCR result: '%s' (length: %d)", panel_text, len(panel_text))
         
         if panel_text and len(panel_text) > 5:  # Lowered threshold from 8 to 5
-            print(f"🔎 Checking for UI keywords in: {panel_text.upper()}")
+            panel_upper = panel_text.upper()
+            logger.debug("🔎 Checking for UI keywords in: %s", panel_upper)
             # Check if this is likely UI text (contains system keywords OR has junk characters)
-            has_ui_keywords = any(keyword in panel_text.upper() for keyword in ui_keywords)
+            has_ui_keywords = self.PANEL_KEYWORDS_RE.search(panel_upper) is not None
             
             # Detect gibberish: lots of short words (2 chars or less), or junk ratio > 20%
             words = panel_text.split()
@@ -197,16 +225,24 @@ class OCRService:
             
             # Count junk characters
             total_chars = len(panel_text)
-            alpha_chars = sum(1 for char in panel_text if char.isalpha())
-            junk_chars = sum(1 for char in panel_text if not char.isalnum() and char not in " ?!.,;:-'\"")
+            junk_chars = _panel_junk_count(panel_text)
             junk_ratio = junk_chars / max(1, total_chars)
             
-            is_gibberish = short_word_ratio > 0.5 or junk_ratio > 0.2 or any(char in panel_text for char in ["\\", "|", "Ny", "Qe", "Oy", "Ap", "Ay"])
+            is_gibberish = short_word_ratio > 0.5 or junk_ratio > 0.2 or self.GIBBERISH_RE.search(panel_text) is not None
             
-            print(f"🔎 Analysis: short_word_ratio={short_word_ratio:.2f}, junk_ratio={junk_ratio:.2f}, is_gibberish={is_gibberish}")
+            logger.debug(
+                "🔎 Analysis: short_word_ratio=%.2f, junk_ratio=%.2f, is_gibberish=%s",
+                short_word_ratio,
+                junk_ratio,
+                is_gibberish,
+            )
             
             if has_ui_keywords or is_gibberish:
-                print(f"✅ Adding panel as UI element (keywords: {has_ui_keywords}, gibberish: {is_gibberish})")
+                logger.info(
+                    "✅ Adding panel as UI element (keywords: %s, gibberish: %s)",
+                    has_ui_keywords,
+                    is_gibberish,
+                )
                 ui_bubbles.append(
                     DetectedBubble(
                         bubble_id="ui_panel",
@@ -216,7 +252,7 @@ class OCRService:
                     )
                 )
             else:
-                print(f"❌ Panel text rejected (no UI keywords or gibberish pattern)")
+                logger.debug("❌ Panel text rejected (no UI keywords or gibberish pattern)")
         
         # Check bottom region for UI text (bottom 20% of image)
         bottom_region = (0, int(height * 0.8), width, height)
@@ -269,7 +305,7 @@ class OCRService:
                 confidence = 0
             if confidence < 25:
                 continue
-            cleaned = re.sub(r"[^A-Za-z0-9'\"-]+", "", text).upper()
+            cleaned = _DATA_WORD_JUNK_RE.sub("", text).upper()
             if len(cleaned) < 2:
                 continue
             words.append(cleaned)
@@ -279,9 +315,9 @@ class OCRService:
         if not text:
             return ""
         cleaned = text.replace("|", "I")
-        cleaned = re.sub(r"[\r\n]+", " ", cleaned)
-        cleaned = re.sub(r"[^A-Za-z0-9'\"?!., ]+", " ", cleaned)
-        cleaned = re.sub(r"\s+", " ", cleaned).strip()
+        cleaned = _LINE_BREAKS_RE.sub(" ", cleaned)
+        cleaned = _UI_JUNK_RE.sub(" ", cleaned)
+        cleaned = _WHITESPACE_RE.sub(" ", cleaned).strip()
         return cleaned
 
     def _score_ui_candidate(self, text: str) -> int:
@@ -289,13 +325,16 @@ class OCRService:
             return 0
         upper = text.upper()
         score = sum(upper.count(keyword) * 8 for keyword in self.UI_KEYWORDS)
-        score += sum(1 for char in upper if char.isalpha())
+        if upper.isascii():
+            score += len(upper.translate(_ASCII_NON_ALPHA_DELETE))
+        else:
+            score += sum(1 for char in upper if char.isalpha())
         score -= upper.count("|") * 2
         return score
 
     def _normalize_ui_text(self, text: str) -> str:
         upper = text.upper()
-        if all(keyword in upper for keyword in ["YOU", "ARE", "NOW", "CHARACTER", "KNIGHT", "BLOOD", "IRON"]):
+        if all(keyword in upper for keyword in self.KNIGHT_TITLE_KEYWORDS):
             return "YOU ARE NOW A CHARACTER OF 'KNIGHT OF BLOOD AND IRON'."
         if upper.startswith("YOU ARE NOW") and not upper.endswith((".", "?", "!")):
             return text.rstrip() + "."
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
 import uuid
-from redis import Redis
+from typing import Any, Callable, Iterator
 
-from app.core.config import settings
-from app.models.schemas import ChapterPayload, JobStatus, SpeakerUpdate
+from redis import Redis
+from redis.exceptions import WatchError
 from rq import Queue
 
-from app.services.tts import tts_service
+from app.core.config import settings
+from app.models.schemas import BubbleItem, ChapterPayload, JobStatus, SpeakerUpdate
+from app.services.tts import TTSResult, tts_service
 
 
 def _redis_client() -> Redis:
     return Redis.from_url(settings.redis_url, decode_responses=True)
 
 
+def _speaker_bubbles(chapter: ChapterPayload, speaker_id: str) -> Iterator[BubbleItem]:
+    for page in chapter.pages:
+        for bubble in page.items:
+            if bubble.speaker_id == speaker_id:
+                yield bubble
+
+
 class ChapterStore:
     def __init__(self) -> None:
         self.redis = _redis_client()
@@ -55,25 +64,90 @@ class ChapterStore:
             return None
         return JobStatus.model_validate_json(payload)
 
-    def update_speaker(self, speaker_id: str, patch: SpeakerUpdate) -> None:
+    def update_speaker(self, speaker_id: str, patch: SpeakerUpdate) -> bool:
+        """Apply a name change; returns True when a voice change needs new audio.
+
+        A new voice_id is not stored here. resynthesize_speaker stores it together
+        with the audio recorded in it, so a bubble never pairs one voice with
+        another voice's clip, and a failed job leaves the old voice in place.
+        """
+        voice_changed = False
+
+        def rename(chapter: ChapterPayload) -> bool:
+            nonlocal voice_changed
+            updated = False
+            for bubble in _speaker_bubbles(chapter, speaker_id):
+                if patch.display_name is not None:
+                    bubble.speaker_name = patch.display_name
+                    updated = True
+                if patch.voice_id is not None and bubble.voice_id != patch.voice_id:
+                    voice_changed = True
+            return updated
+
+        for chapter_id in self.redis.hkeys(self.chapter_key):
+            self._patch_chapter(chapter_id, rename)
+        return voice_changed
+
+    def resynthesize_speaker(self, speaker_id: str, voice_id: str) -> None:
+        """Switch a speaker's bubbles to ``voice_id`` along with audio in that voice.
+
+        TTS runs outside any transaction. Each chapter is then re-read, and only
+        bubbles whose text was synthesized get the new voice and clip, so edits
+        made while the audio was generated are kept.
+        """
         for chapter_id, payload in self.redis.hscan_iter(self.chapter_key):
             chapter = ChapterPayload.model_validate_json(payload)
-            updated = False
-            for page in chapter.pages:
-                for bubble in page.items:
-                    if bubble.speaker_id != speaker_id:
-                        continue
-                    if patch.display_name is not None:
-                        bubble.speaker_name = patch.display_name
-                        updated = True
-                    if patch.voice_id is not None:
-                        bubble.voice_id = patch.voice_id
-                        tts_result = tts_service.synthesize(bubble.text, bubble.voice_id)
-                        bubble.audio_url = tts_result.audio_url
-                        bubble.word_times = tts_result.word_times
-                        updated = True
-            if updated:
-                self.redis.hset(self.chapter_key, chapter_id, chapter.model_dump_json())
+            texts = {
+                bubble.text
+                for bubble in _speaker_bubbles(chapter, speaker_id)
+                if bubble.voice_id != voice_id
+            }
+            if not texts:
+                continue
+            clips = {text: tts_service.synthesize(text, voice_id) for text in texts}
+            self._patch_chapter(chapter_id, _apply_clips, speaker_id, voice_id, clips)
+
+    def _patch_chapter(
+        self, chapter_id: str, mutate: Callable[..., bool], *args: Any
+    ) -> None:
+        """Read-modify-write one chapter; retried if it changes before the write.
+
+        ``mutate`` edits the chapter in place and returns False to skip the write.
+        """
+        with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(self.chapter_key)
+                    payload = pipe.hget(self.chapter_key, chapter_id)
+                    if payload is None:
+                        return
+                    chapter = ChapterPayload.model_validate_json(payload)
+                    if not mutate(chapter, *args):
+                        return
+                    pipe.multi()
+                    pipe.hset(self.chapter_key, chapter_id, chapter.model_dump_json())
+                    pipe.execute()
+                    return
+                except WatchError:
+                    continue
+
+
+def _apply_clips(
+    chapter: ChapterPayload,
+    speaker_id: str,
+    voice_id: str,
+    clips: dict[str, TTSResult],
+) -> bool:
+    updated = False
+    for bubble in _speaker_bubbles(chapter, speaker_id):
+        clip = clips.get(bubble.text)
+        if clip is None:
+            continue
+        bubble.voice_id = voice_id
+        bubble.audio_url = clip.audio_url
+        bubble.word_times = clip.word_times
+        updated = True
+    return updated
 
 
 chapter_store = ChapterStore()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+import logging
 import random
 import time
 from dataclasses import dataclass
@@ -7,13 +9,66 @@ from typing import List
 from uuid import uuid4
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from app.core.cache import ReplyCache
 from app.core.config import settings
 from app.core.storage import storage_client
 from app.models.schemas import WordTime
 
+try:  # Optional dependency; C-accelerated JSON encoding when available
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional import
+    orjson = None  # type: ignore
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Shared session so consecutive TTS clips reuse the TLS connection to each
+# provider. The adapter only retries failed connection setup, never a request
+# that was already sent, while 429s go through _synthesize_openai's own backoff.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            connect=2,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=0.5,
+            allowed_methods=None,
+        ),
+    ),
+)
+
+# Static request headers, built once; each call only serializes its own payload
+_ELEVEN_HEADERS = {
+    "xi-api-key": settings.elevenlabs_api_key or "",
+    "Accept": "audio/mpeg",
+    "Content-Type": "application/json",
+}
+_OPENAI_TTS_HEADERS = {
+    "Authorization": f"Bearer {(settings.openai_api_key or '').strip()}",
+    "Content-Type": "application/json",
+}
+
+
+# Repeated lines ("Huh?", names, stock shouts) map to the same uploaded clip;
+# the key covers everything that shapes the audio
+_CLIP_CACHE = ReplyCache("tts:clip:", settings.tts_clip_cache_ttl, "TTS clip")
+
+
+def _json_body(payload: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+@dataclass(slots=True)
 class TTSResult:
     audio_url: str
     word_times: List[WordTime]
@@ -88,53 +143,111 @@ class TTSService:
         style: float | None = None,
         tone_hint: str | None = None,
     ) -> TTSResult:
-        print(
-            f"🔊 TTS Request: text='{text[:50]}...' voice={voice_id} "
-            f"stability={stability} style={style if style is not None else 'default'}"
+        logger.info(
+            "🔊 TTS Request: text='%s...' voice=%s stability=%s style=%s",
+            text[:50],
+            voice_id,
+            stability,
+            style if style is not None else "default",
         )
         provider_chain = [
             provider.strip()
             for provider in settings.tts_provider_priority.split(",")
             if provider.strip()
         ]
-        print(f"📋 Provider chain: {provider_chain}, ElevenLabs key set: {bool(settings.elevenlabs_api_key)}")
-        
+        cache_key = _CLIP_CACHE.key(
+            ",".join(provider_chain),
+            self.ELEVEN_MODEL,
+            self.OPENAI_TTS_MODEL,
+            text,
+            voice_id,
+            stability,
+            similarity_boost,
+            style,
+            tone_hint,
+        )
+        cached = _CLIP_CACHE.get(cache_key)
+        if cached is not None:
+            result = self._result_from_cache(cached)
+            if result is not None:
+                logger.info("♻️ TTS clip served from cache: %s", result.audio_url[:100])
+                return result
+        result = self._synthesize_uncached(
+            text, voice_id, provider_chain, stability, similarity_boost, style, tone_hint
+        )
+        # Data URLs are the storage-failure fallback; only real uploads are reusable
+        if result.audio_url and not result.audio_url.startswith("data:"):
+            _CLIP_CACHE.set(
+                cache_key,
+                _json_body(
+                    {
+                        "audio_url": result.audio_url,
+                        "word_times": [word.model_dump() for word in result.word_times],
+                    }
+                ),
+            )
+        return result
+
+    def _result_from_cache(self, cached: str) -> TTSResult | None:
+        try:
+            data = json.loads(cached)
+            return TTSResult(
+                audio_url=data["audio_url"],
+                word_times=[WordTime(**word) for word in data["word_times"]],
+            )
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _synthesize_uncached(
+        self,
+        text: str,
+        voice_id: str,
+        provider_chain: list[str],
+        stability: float,
+        similarity_boost: float,
+        style: float | None,
+        tone_hint: str | None,
+    ) -> TTSResult:
+        logger.debug(
+            "📋 Provider chain: %s, ElevenLabs key set: %s",
+            provider_chain,
+            bool(settings.elevenlabs_api_key),
+        )
+
         for provider in provider_chain:
             if provider == "elevenlabs" and settings.elevenlabs_api_key:
                 try:
-                    print(f"🎤 Attempting ElevenLabs synthesis...")
+                    logger.debug("🎤 Attempting ElevenLabs synthesis...")
                     result = self._synthesize_elevenlabs(
                         text, voice_id, stability, similarity_boost, style, tone_hint
                     )
-                    print(f"✅ ElevenLabs SUCCESS! Audio URL: {result.audio_url[:100]}")
+                    logger.info("✅ ElevenLabs SUCCESS! Audio URL: %s", result.audio_url[:100])
                     return result
                 except Exception as e:
-                    print(f"❌ ElevenLabs TTS failed: {type(e).__name__}: {str(e)}")
+                    logger.error("❌ ElevenLabs TTS failed: %s: %s", type(e).__name__, e)
                     continue
             if provider == "openai" and settings.openai_api_key:
                 try:
-                    print("🎤 Attempting OpenAI TTS synthesis...")
+                    logger.debug("🎤 Attempting OpenAI TTS synthesis...")
                     result = self._synthesize_openai(text, voice_id, tone_hint=tone_hint)
-                    print(f"✅ OpenAI TTS SUCCESS! Audio URL: {result.audio_url[:100]}")
+                    logger.info("✅ OpenAI TTS SUCCESS! Audio URL: %s", result.audio_url[:100])
                     return result
                 except Exception as e:
-                    print(f"❌ OpenAI TTS failed: {type(e).__name__}: {str(e)}")
+                    logger.error("❌ OpenAI TTS failed: %s: %s", type(e).__name__, e)
                     continue
         if settings.openai_api_key:
-            print(
-                f"⚠️ Provider chain exhausted; forcing OpenAI TTS for: {text[:50]}..."
-            )
+            logger.warning("⚠️ Provider chain exhausted; forcing OpenAI TTS for: %s...", text[:50])
             try:
                 result = self._synthesize_openai(text, voice_id, tone_hint=tone_hint)
-                print(
-                    f"✅ OpenAI forced fallback SUCCESS! Audio URL: {result.audio_url[:100]}"
+                logger.info(
+                    "✅ OpenAI forced fallback SUCCESS! Audio URL: %s", result.audio_url[:100]
                 )
                 return result
             except Exception as e:
-                print(f"❌ OpenAI forced fallback failed: {type(e).__name__}: {str(e)}")
+                logger.error("❌ OpenAI forced fallback failed: %s: %s", type(e).__name__, e)
                 raise
-        print(
-            f"❌ No TTS providers succeeded and no OpenAI key configured for: {text[:50]}..."
+        logger.error(
+            "❌ No TTS providers succeeded and no OpenAI key configured for: %s...", text[:50]
         )
         raise RuntimeError("No TTS providers available")
 
@@ -159,11 +272,6 @@ class TTSService:
     ) -> TTSResult:
         resolved_voice = self.ELEVEN_VOICE_MAP.get(voice_id, self.ELEVEN_VOICE_MAP["voice_narrator"])
         url = f"https://api.elevenlabs.io/v1/text-to-speech/{resolved_voice}"
-        headers = {
-            "xi-api-key": settings.elevenlabs_api_key or "",
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-        }
         voice_settings = {
             "stability": stability,
             "similarity_boost": similarity_boost,
@@ -181,7 +289,9 @@ class TTSService:
             "model_id": self.ELEVEN_MODEL,
             "voice_settings": voice_settings,
         }
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
+        response = _SESSION.post(
+            url, headers=_ELEVEN_HEADERS, data=_json_body(payload), timeout=60
+        )
         response.raise_for_status()
         audio_bytes = response.content
         key = f"tts/{voice_id}/{uuid4().hex}.mp3"
@@ -191,43 +301,45 @@ class TTSService:
     def _synthesize_openai(
         self, text: str, voice_id: str, tone_hint: str | None = None
     ) -> TTSResult:
-        api_key = (settings.openai_api_key or "").strip()
-        if not api_key:
+        if not (settings.openai_api_key or "").strip():
             raise RuntimeError("OpenAI API key missing")
         voice = self.OPENAI_VOICE_MAP.get(voice_id, "alloy")
         url = "https://api.openai.com/v1/audio/speech"
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
-        payload = {
-            "model": self.OPENAI_TTS_MODEL,
-            "voice": voice,
-            "format": "mp3",
-            "input": text,
-        }
+        # Serialized once; rate-limit retries resend the same bytes
+        body = _json_body(
+            {
+                "model": self.OPENAI_TTS_MODEL,
+                "voice": voice,
+                "format": "mp3",
+                "input": text,
+            }
+        )
         max_attempts = 8
         last_error: Exception | None = None
         audio_bytes: bytes | None = None
         for attempt in range(max_attempts):
-            response = requests.post(url, headers=headers, json=payload, timeout=60)
+            response = _SESSION.post(url, headers=_OPENAI_TTS_HEADERS, data=body, timeout=60)
             if response.status_code == 429:
                 wait_time = min(20.0, 3.0 * (attempt + 1))
-                body = response.text if response is not None else ""
-                print(
-                    f"⚠️ OpenAI TTS rate limited (attempt {attempt + 1}/{max_attempts}). "
-                    f"Waiting {wait_time:.2f}s. Response: {body[:160]}"
+                error_text = response.text if response is not None else ""
+                logger.warning(
+                    "⚠️ OpenAI TTS rate limited (attempt %d/%d). Waiting %.2fs. Response: %s",
+                    attempt + 1,
+                    max_attempts,
+                    wait_time,
+                    error_text[:160],
                 )
-                last_error = requests.HTTPError(body, response=response)
+                last_error = requests.HTTPError(error_text, response=response)
                 time.sleep(wait_time)
                 continue
             try:
                 response.raise_for_status()
             except requests.HTTPError as exc:
-                body = response.text if response is not None else ""
-                print(
-                    f"❌ OpenAI HTTPError "
-                    f"{response.status_code if response else '??'}: {body[:500]}"
+                error_text = response.text if response is not None else ""
+                logger.error(
+                    "❌ OpenAI HTTPError %s: %s",
+                    response.status_code if response else "??",
+                    error_text[:500],
                 )
                 last_error = exc
                 break
@@ -1,26 +1,647 @@
 from __future__ import annotations
 
-import base64
+import asyncio
+import hashlib
 import io
 import json
+import logging
+import random
 import re
+import threading
 import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Callable, Coroutine, Iterable, Iterator, Mapping, TypeVar
 
+import httpx
+import numpy as np
 import requests
 from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from app.core.cache import ReplyCache
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 try:  # Optional dependency; degrade gracefully if unavailable
     from paddleocr import PaddleOCR  # type: ignore
 except Exception:  # pragma: no cover - optional import
     PaddleOCR = None  # type: ignore
 
+try:  # Optional dependency; C-accelerated JSON decoding when available
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional import
+    orjson = None  # type: ignore
+
+try:  # Optional dependency; SIMD base64 for the per-slice image payloads, encoded straight to str
+    from pybase64 import b64encode_as_string as _b64encode_str  # type: ignore
+except Exception:  # pragma: no cover - optional import
+    from base64 import b64encode as _b64encode
+
+    def _b64encode_str(data: bytes | memoryview) -> str:
+        return _b64encode(data).decode("ascii")
+
+try:  # Optional dependency (vision group); libjpeg-turbo decode for full pages
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover - optional import
+    cv2 = None  # type: ignore
+
+try:  # Optional dependency; libjpeg-turbo SIMD encode for slice and bubble JPEGs
+    from turbojpeg import TJPF_GRAY, TJPF_RGB, TJSAMP_420, TJSAMP_GRAY, TurboJPEG  # type: ignore
+
+    _TURBOJPEG = TurboJPEG()
+except Exception:  # pragma: no cover - optional import or missing libturbojpeg
+    _TURBOJPEG = None
+
+
+_TRANSCRIBE_PROMPT = (
+    "Transcribe this manga speech bubble exactly as written. Preserve punctuation, "
+    "question marks, ellipses, shouting, and casing. Return ONLY the text."
+)
+
+_READ_REGION_PROMPT = (
+    "Read ONLY the text visible in this cropped bubble/panel. "
+    "Return just the text (single line)."
+)
+
+_PAGE_PROMPT_PREAMBLE = (
+    "You are an expert manga letterer and voice director. "
+    "Look at the ENTIRE page and extract EVERY readable text element: speech bubbles, narration boxes, "
+    "system/U.I. panels, glowing screens, and sound effects. "
+    "Return results in reading order (top-to-bottom, left-to-right) as STRICT JSON (no narration outside JSON). "
+)
+
+# Speaker metadata costs several output tokens per bubble; by default the model
+# only transcribes and voices are picked locally by _analyze_from_text.
+if settings.vision_request_metadata:
+    _PAGE_PROMPT = _PAGE_PROMPT_PREAMBLE + (
+        "Each entry must be an object with: "
+        '{"text":"..." , "speaker_gender":"male|female|unknown", '
+        '"speaker_age":"child|teen|young adult|adult", '
+        '"emotion":"happy|sad|angry|scared|serious|neutral", '
+        '"tone":"playful|serious|questioning|dramatic|neutral", '
+        '"bubble_type":"dialogue|thought|narration|system|sfx" }.'
+    )
+else:
+    _PAGE_PROMPT = _PAGE_PROMPT_PREAMBLE + (
+        'Each entry must be an object with only a "text" field: {"text":"..."}.'
+    )
+
+_SEGMENT_PROMPT_TMPL = (
+    _PAGE_PROMPT.replace("{", "{{").replace("}", "}}")
+    + " You are looking only at segment {index} of {total}, "
+    "covering vertical pixels {start} through {end}. "
+    "Focus on text inside this slice only."
+)
+
+_COMBINED_PROMPT_TMPL = (
+    _PAGE_PROMPT.replace("{", "{{").replace("}", "}}")
+    + " The page has been split into {total} vertical segments, each image preceded by "
+    "a '--- SEGMENT k ---' marker with its pixel range. "
+    'Return ONE JSON object {{"segments": [[...], [...], ...]}} holding exactly {total} '
+    "arrays, one per segment in order, each listing only the text inside that segment."
+)
+
+_BUBBLES_PROMPT_TMPL = (
+    "Each of the {total} images is one cropped manga speech bubble, preceded by a "
+    "'--- BUBBLE k ---' marker. Transcribe every bubble exactly as written, preserving "
+    "punctuation, question marks, ellipses, shouting, and casing. "
+    'Return ONLY a JSON array of exactly {total} strings, one per bubble in order; '
+    'use "" for a bubble with no readable text.'
+)
+
+_VISION_MODEL = "gpt-4o-mini"
+
+_META_FIELDS = (
+    "speaker gender",
+    "speaker_gender",
+    "gender",
+    "speaker age",
+    "speaker_age",
+    "age",
+    "bubble type",
+    "bubble_type",
+    "emotion",
+    "tone",
+)
+
+_SFX_KEYWORDS = frozenset(
+    {
+        "boom",
+        "bang",
+        "pow",
+        "wham",
+        "slam",
+        "crash",
+        "clang",
+        "clank",
+        "snap",
+        "whoosh",
+        "thud",
+        "zap",
+        "kaboom",
+        "zing",
+    }
+)
+
+# Keyword categories used by the text-only voice heuristics
+_TEXT_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "system": ("you are now", "system", "quest", "mission", "objective", "status"),
+    "warrior": ("knight", "iron", "blood", "sword", "battle", "fight", "warrior", "soldier"),
+    "adult_male": ("sir", "captain", "commander", "master", "lord", "king"),
+    "young_male": ("bro", "dude", "hey", "yeah", "whoa"),
+    "child": ("mom", "mommy", "dad", "daddy", "scared", "wanna", "gonna"),
+    "elegant": ("grace", "beauty", "elegant", "lovely", "delicate"),
+    "wise": ("ancient", "wisdom", "elder", "sage", "experience"),
+    "male_child": ("boy", "son", "he", "him", "his"),
+}
+_KEYWORD_CATEGORY = {
+    keyword: category
+    for category, keywords in _TEXT_KEYWORDS.items()
+    for keyword in keywords
+}
+# Keyword-driven voice archetypes in priority order:
+# (categories that trigger the rule, archetype, stability override or None)
+_ARCHETYPE_RULES: tuple[tuple[frozenset[str], str, float | None], ...] = (
+    # Child voice; switched to child_male when boy/son/he cues are present
+    (frozenset({"child"}), "child_female", 0.35),
+    # Adult male voice for warriors/authority figures
+    (frozenset({"warrior", "adult_male"}), "adult_male", None),
+    (frozenset({"young_male"}), "young_male", None),
+    # Mature female voice for wise/elegant characters
+    (frozenset({"wise", "elegant"}), "adult_female", None),
+)
+
+# Whole words (plus a plural "s") so "question" no longer reads as "quest"
+_KEYWORD_RE = re.compile(
+    r"\b("
+    + "|".join(
+        re.escape(keyword) for keyword in sorted(_KEYWORD_CATEGORY, key=len, reverse=True)
+    )
+    + r")s?\b"
+)
+
+# Patterns used while parsing vision responses, compiled once at import
+_LIST_PREFIX_RE = re.compile(r"^\d+[\)\.:-]\s*")
+_BUBBLE_PREFIX_RE = re.compile(r"(?i)^(bubble|panel|text|speech)\s*\d*\s*[:\-]\s*")
+_BUBBLE_PREFIX_INITIALS = frozenset("bpst")  # casefolded first letters of its labels
+_BUBBLE_END_CHARS = tuple(".?!…\"”")
+_TEXT_KV_RE = re.compile(r"(?i)text\s*[:=]\s*(.+)")
+_META_RE = re.compile(
+    r"(?i)\b(?:"
+    + "|".join(re.escape(field) for field in _META_FIELDS)
+    + r")\b\s*(?:[:=\-]\s*)?(?:\"[^\"]*\"|'[^']*'|[A-Za-z ]+)"
+)
+# Pronouns/honorifics as space-delimited words (titles like "mr." only need the
+# leading space); one scan finds every cue and its gender group
+_GENDER_RE = re.compile(
+    r"(?<![^ ])(?:"
+    r"(?P<male>(?:he|his|him|sir|lord|brother|dad|father|king|dude|bro|man)(?![^ ])|mr\.)"
+    r"|(?P<female>(?:she|her|hers|lady|miss|sister|mom|mother|queen|girl)(?![^ ])|ma'am|mrs\.)"
+    r")"
+)
+
+_MULTI_SPACE_RE = re.compile(r"\s{2,}")
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_ALPHA_RE = re.compile(r"[^a-zA-Z]+")
+# Deleting the characters OCR normally produces leaves only the junk ones
+_OCR_ALLOWED_DELETE = str.maketrans(
+    "", "", "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 ?!.,;:-'\""
+)
+# Common OCR mistakes with UI text
+_OCR_GIBBERISH_RE = re.compile(r"\\|\||Ny |Sy\.|gl ag|eo y")
+
+# str.translate deletion tables: what survives is the letters / uppercase letters
+_ASCII_NON_ALPHA_DELETE = str.maketrans(
+    "", "", "".join(char for char in map(chr, range(128)) if not char.isalpha())
+)
+_ASCII_NON_UPPER_DELETE = str.maketrans(
+    "", "", "".join(char for char in map(chr, range(128)) if not char.isupper())
+)
+_SFX_PUNCT_RE = re.compile(r"[A-Z0-9!?~\\-]+")
+_REPEATED_RE = re.compile(r"(.)\1{2,}")
+
+# Upper bound on concurrent per-slice vision requests for one page
+MAX_PARALLEL_SLICES = 8
+
+# Upper bound on concurrent per-bubble transcription requests for one page
+MAX_PARALLEL_BUBBLES = 8
+
+# Local bubble crops are transcribed this many to a request, sharing one prompt
+BUBBLE_BATCH_SIZE = 10
+
+# Encoding used for images sent to the vision model (VISION_IMAGE_FORMAT=png for pixel-exact crops)
+_IMAGE_FORMAT = "png" if settings.vision_image_format.lower() == "png" else "jpeg"
+_IMAGE_MIME = f"image/{_IMAGE_FORMAT}"
+
+# Slices whose grayscale min-max spread is below this are blank gutters; the
+# spread tolerates JPEG noise but any line of ink exceeds it
+BLANK_SLICE_RANGE = 24
+
+# Blank bands at least this tall (page px) are safe places to end a slice, and
+# slices cut there only overlap the next one by SAFE_SPLIT_OVERLAP
+SAFE_SPLIT_MIN_BAND = 8
+SAFE_SPLIT_OVERLAP = 64
+
+# Refuse to decode anything larger (decompression bomb guard); long webtoon
+# strips legitimately exceed Pillow's 89MP default
+Image.MAX_IMAGE_PIXELS = settings.max_image_pixels
+
+# Decoded pages kept in memory; a page is read by every slice and bubble crop
+PAGE_CACHE_SIZE = 2
+
+# Long-edge budget for single-region reads sent at detail=low
+REGION_MAX_DIM = 768
+
+# Long-edge budget for bubble crops sent for full transcription
+BUBBLE_MAX_DIM = 1024
+
+# Bubble crops larger than this many pixels are shrunk to REGION_MAX_DIM;
+# they are sent at detail=low, which the model sees at 512px anyway
+BUBBLE_FULL_RES_AREA = 512 * 512
+
+# Detected boxes hug the glyphs; pad crops so antialiased edge strokes survive
+CROP_PADDING = 10
+
+# Width/height ratio above which a text box is treated as a narration caption
+NARRATION_BOX_ASPECT = 4.0
+
+# Static parts of every Responses API request; only the prompt, image, and
+# token budget change per call.
+_OPENAI_HEADERS = {
+    "Authorization": f"Bearer {settings.openai_api_key}",
+    "Content-Type": "application/json",
+}
+# Greedy decoding: a transcription should not change between identical requests,
+# which is also what makes the reply cache safe
+_BASE_PAYLOAD = {"model": _VISION_MODEL, "temperature": 0}
+
+# Longest we ever wait between vision retries, whatever Retry-After says
+RETRY_MAX_DELAY = 60.0
+
+# Multiplex the per-bubble async calls over one connection when h2 is installed
+_HTTP2 = find_spec("h2") is not None
+
+# Shared session so consecutive vision calls reuse the TLS connection. The
+# pool is sized for the parallel slice workers. The adapter only retries failed
+# connection setup; once a request is on the wire a read error or timeout is not
+# resent (it may already be billed), and 429/5xx go through _send_openai's backoff.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=2,
+            connect=2,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=0.5,
+            allowed_methods=None,
+        ),
+    ),
+)
+
+
+# Rough per-image input token cost used for TPM budgeting (detail=low is a flat
+# 85; other details are charged per 512px tile, ~4 tiles for our image sizes)
+_IMAGE_TOKENS_LOW = 85
+_IMAGE_TOKENS_DEFAULT = 765
+
+
+class _RateLimiter:
+    """Requests- and tokens-per-minute buckets shared by every vision call in the process.
+
+    ``reserve`` books capacity up front and returns how long the caller must wait
+    before sending, so worker threads (time.sleep) and coroutines (asyncio.sleep)
+    follow one schedule. A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, rpm: int, tpm: int) -> None:
+        self._rpm = rpm
+        self._tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._paused_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._updated = now
+            wait = max(0.0, self._paused_until - now)
+            # Buckets may go negative: that debt is what later callers wait out
+            if self._rpm:
+                self._requests = min(self._rpm, self._requests + elapsed * self._rpm / 60)
+                self._requests -= 1
+                if self._requests < 0:
+                    wait = max(wait, -self._requests * 60 / self._rpm)
+            if self._tpm:
+                self._tokens = min(self._tpm, self._tokens + elapsed * self._tpm / 60)
+                self._tokens -= min(tokens, self._tpm)
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens * 60 / self._tpm)
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back after the server reported a rate limit."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+_RATE_LIMITER = _RateLimiter(settings.openai_vision_rpm, settings.openai_vision_tpm)
+
+
+# Identical requests read the same at temperature 0, so reruns of a chapter answer
+# from Redis instead of the API. Empty or unparseable replies are never stored, and
+# the t0 prefix leaves replies cached before temperature was pinned behind
+_RESPONSE_CACHE = ReplyCache("vision:reply:t0:", settings.vision_reply_cache_ttl, "Vision reply")
+
+
+@lru_cache(maxsize=64)
+def _prompt_cache_key(instructions: str) -> str:
+    return "inkami-vision-" + hashlib.blake2b(instructions.encode(), digest_size=8).hexdigest()
+
+
+def _estimate_request_tokens(payload: Mapping[str, Any]) -> int:
+    tokens = int(payload.get("max_output_tokens") or 0)
+    tokens += len(payload.get("instructions") or "") // 4
+    for message in payload.get("input") or []:
+        for part in message.get("content") or []:
+            if part.get("type") == "input_text":
+                tokens += len(part.get("text") or "") // 4
+            elif part.get("type") == "input_image":
+                tokens += (
+                    _IMAGE_TOKENS_LOW if part.get("detail") == "low" else _IMAGE_TOKENS_DEFAULT
+                )
+    return tokens
+
+
+# Decodes one array element at a time out of a partially streamed response
+_JSON_DECODER = json.JSONDecoder()
+
+# First characters of the JSON replies worth parsing: containers, strings and
+# true/false/null (a bare number is read as bubble text instead)
+_JSON_START_CHARS = frozenset('[{"tfn')
+
+
+def _json_loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# One encode buffer per thread (slice workers encode concurrently). It is
+# rewound, not truncated, so its allocation is reused by the next image
+_ENCODE_BUFFERS = threading.local()
+# A buffer that grew past this (one oversized PNG page) is dropped after use
+# rather than pinned for the life of the thread
+ENCODE_BUFFER_MAX_BYTES = 4 * 1024 * 1024
+
+
+def _save_and_b64encode(image: Image.Image, **save_kwargs: Any) -> str:
+    buffered = getattr(_ENCODE_BUFFERS, "buffer", None)
+    if buffered is None:
+        buffered = _ENCODE_BUFFERS.buffer = io.BytesIO()
+    buffered.seek(0)
+    image.save(buffered, **save_kwargs)
+    size = buffered.tell()
+    with buffered.getbuffer() as view:
+        encoded = _b64encode_str(view[:size])
+    if size > ENCODE_BUFFER_MAX_BYTES:
+        _ENCODE_BUFFERS.buffer = None
+    return encoded
+
+
+def _single_line(text: str) -> str:
+    # Collapses every whitespace run (newlines, tabs, 3+ spaces) in one C-level pass
+    return " ".join(text.split())
+
+
+_T = TypeVar("_T")
+
+
+def _run_sync(coro: Coroutine[Any, Any, _T]) -> _T:
+    """asyncio.run that also works when the calling thread already runs a loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # asyncio.run refuses to nest, so the coroutine gets its own loop on a helper thread
+    with ThreadPoolExecutor(max_workers=1) as runner:
+        return runner.submit(asyncio.run, coro).result()
 
-@dataclass
+
+def _error_excerpt(body: bytes, limit: int = 500) -> str:
+    """First ``limit`` bytes of an error body, decoded without touching the rest."""
+    return body[:limit].decode("utf-8", "replace")
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+_VOICE_MAPPING: Mapping[str, str] = MappingProxyType(
+    {
+        # Female character archetypes
+        "child_female": "voice_child_f",
+        "young_female": "voice_young_f",
+        "adult_female": "voice_adult_f",
+
+        # Male character archetypes
+        "child_male": "voice_child_m",
+        "young_male": "voice_young_m",
+        "adult_male": "voice_adult_m",
+
+        # Special
+        "narrator": "voice_narrator_f",
+        "system": "voice_system",
+    }
+)
+
+
+@lru_cache(maxsize=PAGE_CACHE_SIZE * 2)
+def _load_page_cached(path: str, mtime_ns: int, reduced: bool) -> Image.Image:
+    # Decode once; crops of a loaded image never touch the file again
+    if cv2 is not None and not reduced:
+        # Same pixel frame as Pillow: no EXIF rotation, alpha dropped
+        decoded = cv2.imdecode(
+            np.fromfile(path, dtype=np.uint8),
+            cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION,
+        )
+        if decoded is not None:
+            return Image.fromarray(cv2.cvtColor(decoded, cv2.COLOR_BGR2RGB))
+    with Image.open(path) as image:
+        if reduced and image.format == "JPEG" and _IMAGE_FORMAT != "png":
+            # libjpeg scales by 1/2, 1/4 or 1/8 inside the DCT, never below the
+            # vision encode budget on either axis, so slices lose no detail
+            image.draft("RGB", (settings.vision_max_dim, settings.vision_max_dim))
+        image.load()
+        return image.convert("RGB")
+
+
+# Vision metadata only takes a handful of distinct (gender, age, bubble_type)
+# values, so each combination is resolved once and then served from the cache
+@lru_cache(maxsize=256)
+def _voice_key_for(gender: str, age: str, bubble_type: str) -> str:
+    if bubble_type in {"system", "ui", "computer", "hud"}:
+        return "system"
+    if bubble_type in {"sfx", "fx", "effect", "sound"}:
+        return "sfx"
+    if bubble_type in {"narration", "narrator"}:
+        return "narrator"
+
+    if gender == "male":
+        if any(keyword in age for keyword in ("child", "kid", "boy")):
+            return "child_male"
+        if any(keyword in age for keyword in ("teen", "young", "youth")):
+            return "young_male"
+        return "adult_male"
+
+    if gender == "female":
+        if any(keyword in age for keyword in ("child", "kid", "girl")):
+            return "child_female"
+        if any(keyword in age for keyword in ("teen", "young", "youth")):
+            return "young_female"
+        return "adult_female"
+
+    # Unknown gender: infer from bubble type or default to young female
+    if bubble_type in {"thought"}:
+        return "young_female"
+    if bubble_type in {"sfx"}:
+        return "narrator"
+    return "young_female"
+
+
+def letter_case_counts(text: str) -> tuple[int, int]:
+    """(letters, uppercase letters) in ``text``, counted in C for ASCII input."""
+    if text.isascii():
+        return (
+            len(text.translate(_ASCII_NON_ALPHA_DELETE)),
+            len(text.translate(_ASCII_NON_UPPER_DELETE)),
+        )
+    letters = upper = 0
+    for char in text:
+        if char.isalpha():
+            letters += 1
+            upper += char.isupper()
+    return letters, upper
+
+
+def _infer_gender(text: str) -> str | None:
+    """Heuristic gender detection from pronouns and honorifics."""
+    groups = {match.lastgroup for match in _GENDER_RE.finditer(text)}
+    if "male" in groups:
+        return "male"
+    if "female" in groups:
+        return "female"
+    return None
+
+
+def _text_voice_profile(text: str) -> tuple[str, str, float, str, bool]:
+    """(emotion, tone, stability, voice archetype, has warrior keywords) for ``text``."""
+    text_lower = text.lower()
+    # Detect emotion from text patterns
+    emotion = "neutral"
+    tone = "normal"
+    stability = 0.5
+
+    # Question marks suggest confusion/uncertainty
+    if "?" in text:
+        if "...?" in text or "??" in text:
+            emotion = "confused"
+            tone = "questioning"
+            stability = 0.3  # More expressive
+        else:
+            tone = "questioning"
+            stability = 0.4
+
+    # Exclamation marks suggest excitement/anger
+    if "!" in text:
+        if "!!" in text:
+            emotion = "excited" if len(text) < 50 else "angry"
+            tone = "dramatic"
+            stability = 0.2  # Very expressive
+        else:
+            emotion = "assertive"
+            tone = "emphatic"
+            stability = 0.35
+
+    # Ellipsis suggests thoughtfulness/uncertainty
+    if "..." in text:
+        emotion = "thoughtful"
+        tone = "contemplative"
+        stability = 0.4
+
+    # One scan classifies every voice keyword in the text
+    categories = {
+        _KEYWORD_CATEGORY[match] for match in _KEYWORD_RE.findall(text_lower)
+    }
+
+    # Check for system messages
+    has_system_keywords = "system" in categories
+    has_warrior_keywords = "warrior" in categories
+    has_child_keywords = "child" in categories
+
+    # All-caps dialogue is common in manga, so only treat as system if it has system keywords.
+    # Gender cues never override a system voice, so skip the rest of the scans
+    if has_system_keywords and not has_warrior_keywords:
+        return emotion, tone, max(stability, 0.65), "system", False
+
+    # Determine age group and gender: first keyword rule that fires wins
+    for triggers, voice_archetype, rule_stability in _ARCHETYPE_RULES:
+        if not triggers.isdisjoint(categories):
+            if voice_archetype == "child_female" and "male_child" in categories:
+                voice_archetype = "child_male"
+            if rule_stability is not None:
+                stability = rule_stability
+            break
+    else:
+        if len(text) < 30 and "?" in text:
+            # Short questions often from younger characters
+            voice_archetype = "young_female"
+        elif emotion in {"excited", "assertive"}:
+            # Default to young adult based on emotion
+            voice_archetype = "young_male"
+        else:
+            voice_archetype = "young_female"
+
+    gender_hint = _infer_gender(text_lower)
+    if gender_hint:
+        if gender_hint == "male":
+            if has_child_keywords:
+                voice_archetype = "child_male"
+            elif has_warrior_keywords or len(text) > 70 or "sir" in text_lower:
+                voice_archetype = "adult_male"
+            else:
+                voice_archetype = "young_male"
+        elif gender_hint == "female":
+            if has_child_keywords:
+                voice_archetype = "child_female"
+            elif len(text) > 70 or "lady" in text_lower or "madam" in text_lower:
+                voice_archetype = "adult_female"
+            else:
+                voice_archetype = "young_female"
+
+    return emotion, tone, stability, voice_archetype, has_warrior_keywords
+
+
+@dataclass(slots=True, frozen=True)
 class CharacterAnalysis:
     """Analysis of a character and their emotional state."""
     character_type: str  # e.g., "young_female", "tough_male", "wise_mentor"
@@ -32,7 +653,76 @@ class CharacterAnalysis:
     style: float = 0.2  # 0.0-1.0 intensity for stylistic delivery
 
 
-@dataclass
+# Frozen, so every caller can share the one instance
+_FALLBACK_ANALYSIS = CharacterAnalysis(
+    character_type="unknown",
+    emotion="neutral",
+    tone="normal",
+    voice_suggestion="voice_narrator_f",
+    stability=0.5,
+    similarity_boost=0.75,
+    style=0.2,
+)
+
+
+def _emotion_settings(emotion: str) -> tuple[float, float, float]:
+    emotion = emotion.lower()
+    stability = 0.5
+    similarity = 0.75
+    style = 0.2
+
+    if emotion in {"angry", "furious", "excited", "ecstatic"}:
+        stability = 0.22
+        similarity = 0.68
+        style = 0.85
+    elif emotion in {"happy", "playful", "amused"}:
+        stability = 0.35
+        similarity = 0.75
+        style = 0.6
+    elif emotion in {"sad", "melancholy", "serious", "calm"}:
+        stability = 0.65
+        similarity = 0.82
+        style = 0.35
+    elif emotion in {"scared", "nervous", "anxious"}:
+        stability = 0.4
+        similarity = 0.72
+        style = 0.55
+
+    return stability, similarity, style
+
+
+# The text-derived analysis only depends on the text and whether the bubble sits
+# in the page's top band; repeated lines (SFX, "...", stock replies) recur across
+# a chapter, so identical bubbles share one frozen result
+@lru_cache(maxsize=4096)
+def _text_analysis(text: str, in_top_band: bool) -> CharacterAnalysis:
+    emotion, tone, stability, voice_archetype, has_warrior_keywords = (
+        _text_voice_profile(text)
+    )
+
+    # A bubble in the top ~15% of the page that looks like UI text is a system message
+    if in_top_band and len(text) > 15 and not has_warrior_keywords:
+        voice_archetype = "system"
+        stability = max(stability, 0.6)
+
+    base_stability, similarity_boost, style = _emotion_settings(emotion)
+    if stability == 0.5:
+        stability = base_stability
+    else:
+        stability = min(stability, base_stability)
+
+    return CharacterAnalysis(
+        character_type=voice_archetype,
+        emotion=emotion,
+        tone=tone,
+        voice_suggestion=_VOICE_MAPPING.get(voice_archetype, "voice_narrator_f"),
+        stability=stability,
+        similarity_boost=similarity_boost,
+        style=style,
+    )
+
+
+@dataclass(slots=True)
 class VisionTextEntry:
     text: str
     speaker_gender: str | None = None
@@ -55,30 +745,44 @@ class VisionTextEntry:
         )
 
 
+@dataclass(slots=True, frozen=True)
+class BubbleGeom:
+    """Box-derived values the text classifiers need, computed once per bubble."""
+    width: int
+    height: int
+    in_top_band: bool  # bubble top sits in the top ~15% of the page
+
+    @classmethod
+    def from_box(cls, bubble_box: list[int], page_height: int | float | None) -> BubbleGeom:
+        top = bubble_box[1]
+        if len(bubble_box) > 3:
+            width = bubble_box[2] - bubble_box[0]
+            height = bubble_box[3] - top
+            bottom = bubble_box[3]
+        else:
+            width = height = 0
+            bottom = top + 100
+        effective_height = page_height if page_height and page_height > 0 else bottom
+        return cls(width, height, top / max(1.0, effective_height) <= 0.15)
+
+
+# (slice index, start_y, end_y, raw response text or already-parsed entries)
+_SegmentJob = tuple[int, int, int, str | list[VisionTextEntry] | None]
+
+
 class VisionService:
     """Service for analyzing manga/manhwa images with AI vision."""
 
     OPENAI_URL = "https://api.openai.com/v1/responses"
-    VISION_MODEL = "gpt-4o-mini"
+    VISION_MODEL = _VISION_MODEL
 
-    VOICE_MAPPING = {
-        # Female character archetypes
-        "child_female": "voice_child_f",
-        "young_female": "voice_young_f",
-        "adult_female": "voice_adult_f",
-        
-        # Male character archetypes
-        "child_male": "voice_child_m",
-        "young_male": "voice_young_m",
-        "adult_male": "voice_adult_m",
-        
-        # Special
-        "narrator": "voice_narrator_f",
-        "system": "voice_system",
-    }
+    VOICE_MAPPING = _VOICE_MAPPING
 
     def __init__(self) -> None:
         self._local_detector = None
+        # PaddleOCR predictors are not thread-safe, and page reads, gap recovery
+        # and slices run on worker threads; one detection runs at a time
+        self._local_detector_lock = threading.Lock()
         self._full_page_first = settings.vision_single_pass
         if settings.enable_local_detector and PaddleOCR is not None:
             try:
@@ -90,106 +794,136 @@ class VisionService:
                     lang="en",
                     show_log=False,
                 )
-                print("✨ Local bubble detector enabled (PaddleOCR)")
+                logger.info("✨ Local bubble detector enabled (PaddleOCR)")
             except Exception as exc:  # pragma: no cover - initialization edge cases
                 self._local_detector = None
-                print(f"⚠️ Local bubble detector unavailable: {exc}")
+                logger.warning("⚠️ Local bubble detector unavailable: %s", exc)
         elif settings.enable_local_detector:
-            print("⚠️ PaddleOCR not installed; local detector disabled")
+            logger.warning("⚠️ PaddleOCR not installed; local detector disabled")
 
     def detect_and_read_all_bubbles(self, image_path: Path) -> list[tuple[list[int], str, CharacterAnalysis]]:
         """Use AI vision to find ALL text bubbles and read them in one go."""
         
         if not settings.openai_api_key:
-            print("⚠️ OpenAI API key not set")
+            logger.warning("⚠️ OpenAI API key not set")
             return []
         
         try:
-            color_image = Image.open(image_path)
+            width, height = self.page_size(image_path)
+            # Remote slices only need a decode at the encode budget; the full-size
+            # page is only decoded when there are local crops to cut
+            return self._read_all_bubbles(
+                width,
+                height,
+                image_path,
+                self.load_page(image_path, reduced=True),
+                lambda: self.load_page(image_path),
+            )
+        except Exception as e:
+            logger.error("❌ Vision API failed: %s: %s", type(e).__name__, e)
+            return []
+
+    def detect_and_read_all_bubbles_image(
+        self, image: Image.Image
+    ) -> list[tuple[list[int], str, CharacterAnalysis]]:
+        """detect_and_read_all_bubbles for an image already in memory, such as a
+        crop of a loaded page; nothing is written to disk or added to the page cache.
+        """
+        if not settings.openai_api_key:
+            logger.warning("⚠️ OpenAI API key not set")
+            return []
+
+        try:
+            color_image = image.convert("RGB")
             width, height = color_image.size
-            grayscale_image = color_image.convert("L")
-            color_image.close()
-
-            local_boxes = self._detect_bubble_boxes_local(image_path, width, height)
-            local_bubbles: list[tuple[list[int], str, CharacterAnalysis]] = []
-            if local_boxes:
-                print(f"🧠 Local detector found {len(local_boxes)} candidate bubble boxes")
-                local_bubbles = self._transcribe_local_boxes(
-                    image_path,
-                    local_boxes,
-                    height,
-                )
-                if local_bubbles:
-                    print(f"✨ Local pipeline transcribed {len(local_bubbles)} bubble(s)")
+            return self._read_all_bubbles(
+                width, height, color_image, color_image, lambda: color_image
+            )
+        except Exception as e:
+            logger.error("❌ Vision API failed: %s: %s", type(e).__name__, e)
+            return []
+
+    def _read_all_bubbles(
+        self,
+        width: int,
+        height: int,
+        detector_source: Path | Image.Image,
+        slice_image: Image.Image,
+        load_color: Callable[[], Image.Image],
+    ) -> list[tuple[list[int], str, CharacterAnalysis]]:
+        local_boxes = self._detect_bubble_boxes_local(detector_source, width, height)
+        local_bubbles: list[tuple[list[int], str, CharacterAnalysis]] = []
+        if local_boxes:
+            logger.info("🧠 Local detector found %d candidate bubble boxes", len(local_boxes))
+            local_bubbles = self._transcribe_local_boxes(load_color(), local_boxes, height)
+            if local_bubbles:
+                logger.info("✨ Local pipeline transcribed %d bubble(s)", len(local_bubbles))
 
+        remote_bubbles = self._run_segment_pipeline(
+            slice_image, width, height, single_pass=self._full_page_first
+        )
+        if self._full_page_first and not remote_bubbles:
+            logger.warning(
+                "⚠️ Full-page vision pass returned no text; "
+                "falling back to segmented slices."
+            )
             remote_bubbles = self._run_segment_pipeline(
-                grayscale_image, width, height, single_pass=self._full_page_first
+                slice_image, width, height, single_pass=False
             )
-            if self._full_page_first and not remote_bubbles:
-                print(
-                    "⚠️ Full-page vision pass returned no text; "
-                    "falling back to segmented slices."
-                )
-                remote_bubbles = self._run_segment_pipeline(
-                    grayscale_image, width, height, single_pass=False
-                )
-            grayscale_image.close()
 
-            if local_bubbles and remote_bubbles:
-                merged = self._merge_bubble_sets(local_bubbles, remote_bubbles)
-                print(
-                    f"🤝 Hybrid vision kept {len(merged)} bubbles "
-                    f"(local {len(local_bubbles)} + remote {len(remote_bubbles)})"
-                )
-                return merged
-            if local_bubbles:
-                return local_bubbles
-            return remote_bubbles
-            
-        except Exception as e:
-            print(f"❌ Vision API failed: {type(e).__name__}: {str(e)}")
-            return []
-    
+        if local_bubbles and remote_bubbles:
+            merged = self._merge_bubble_sets(local_bubbles, remote_bubbles)
+            logger.info(
+                "🤝 Hybrid vision kept %d bubbles (local %d + remote %d)",
+                len(merged),
+                len(local_bubbles),
+                len(remote_bubbles),
+            )
+            return merged
+        if local_bubbles:
+            return local_bubbles
+        return remote_bubbles
+
     def read_and_analyze_bubble(
         self,
         image_path: Path,
         bubble_box: list[int],
         page_height: int | float | None = None,
+        image: Image.Image | None = None,
     ) -> tuple[str, CharacterAnalysis]:
-        """Use AI vision to read text from a specific bubble region."""
+        """Use AI vision to read text from a specific bubble region.
+
+        Pass the already-decoded page as ``image`` when reading many bubbles
+        from the same page.
+        """
         
         if not settings.openai_api_key:
-            print("⚠️ OpenAI API key not set, using fallback")
+            logger.warning("⚠️ OpenAI API key not set, using fallback")
             return "", self._fallback_analysis()
         
         try:
-            # Crop the bubble region
-            from PIL import Image
-            image = Image.open(image_path)
-            crop = image.crop((bubble_box[0], bubble_box[1], bubble_box[2], bubble_box[3]))
-            
-            img_base64 = self._encode_image(crop)
-            
-            prompt = (
-                "Transcribe this manga speech bubble exactly as written. Preserve punctuation, "
-                "question marks, ellipses, shouting, and casing. Return ONLY the text."
+            logger.debug("🤖 Calling GPT-4o-mini for bubble at %s", bubble_box)
+            text = self._read_region(
+                image_path,
+                bubble_box,
+                _TRANSCRIBE_PROMPT,
+                max_tokens=200,
+                max_dim=BUBBLE_MAX_DIM,
+                image=image,
             )
-            
-            print(f"🤖 Calling GPT-4o-mini for bubble at {bubble_box}")
-            text = self._call_openai(prompt, img_base64, max_tokens=200)
             if text:
-                text = text.replace("\n", " ").replace("  ", " ").strip()
-                print(f"✨ Vision API read: {text}")
-                analysis = self._analyze_from_text(text, bubble_box, page_height)
+                logger.debug("✨ Vision API read: %s", text)
+                geom = BubbleGeom.from_box(bubble_box, page_height)
+                analysis = self._quick_classify(text, geom)
+                if analysis is None:
+                    analysis = self._analyze_from_text(text, geom)
                 return text, analysis
             
-            print("⚠️ Vision API returned no text")
+            logger.warning("⚠️ Vision API returned no text")
             return "", self._fallback_analysis()
             
         except Exception as e:
-            print(f"❌ Vision API failed: {type(e).__name__}: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
+            logger.exception("❌ Vision API failed: %s: %s", type(e).__name__, e)
             return "", self._fallback_analysis()
     
     def analyze_bubble(
@@ -201,8 +935,50 @@ class VisionService:
     ) -> CharacterAnalysis:
         """Analyze a speech bubble and determine character emotion and voice."""
         
+        # Narration boxes, SFX and one-character reactions never need the full cascade
+        geom = BubbleGeom.from_box(bubble_box, page_height)
+        quick = self._quick_classify(text, geom)
+        if quick is not None:
+            return quick
+
         # Use smart text analysis to determine emotion and voice
-        return self._analyze_from_text(text, bubble_box, page_height)
+        return self._analyze_from_text(text, geom)
+
+    def _quick_classify(self, text: str, geom: BubbleGeom) -> CharacterAnalysis | None:
+        """Cheap rules for bubbles whose voice is obvious; None means "ask the full analyzer"."""
+        cleaned = text.strip()
+        if len(cleaned) < 3:
+            # _analyze_from_text already answers these with the shared fallback
+            return None
+        # Shouted dialogue is all caps too, so the model is only skipped when the
+        # text also names a sound effect
+        if self._has_sfx_keyword(cleaned) and self._looks_like_sfx(cleaned):
+            return self._sfx_analysis()
+        # Wide, flat rectangles are caption/narration boxes rather than balloons
+        if geom.height > 0 and geom.width / geom.height >= NARRATION_BOX_ASPECT:
+            stability, similarity, style = self._emotion_to_settings("neutral")
+            return CharacterAnalysis(
+                character_type="narrator",
+                emotion="neutral",
+                tone="normal",
+                voice_suggestion=_VOICE_MAPPING["narrator"],
+                stability=stability,
+                similarity_boost=similarity,
+                style=style,
+            )
+        return None
+
+    def _sfx_analysis(self) -> CharacterAnalysis:
+        voice_id = _VOICE_MAPPING.get("sfx", _VOICE_MAPPING["narrator"])
+        return CharacterAnalysis(
+            character_type="sfx_autodetect",
+            emotion="neutral",
+            tone="impact",
+            voice_suggestion=voice_id,
+            stability=0.3,
+            similarity_boost=0.85,
+            style=0.7,
+        )
 
     def _analysis_from_entry(
         self,
@@ -216,17 +992,10 @@ class VisionService:
             if metadata_analysis:
                 return metadata_analysis
         if self._looks_like_sfx(fallback_text):
-            voice_id = self.VOICE_MAPPING.get("sfx", self.VOICE_MAPPING["narrator"])
-            return CharacterAnalysis(
-                character_type="sfx_autodetect",
-                emotion="neutral",
-                tone="impact",
-                voice_suggestion=voice_id,
-                stability=0.3,
-                similarity_boost=0.85,
-                style=0.7,
-            )
-        return self._analyze_from_text(fallback_text, bubble_box, page_height)
+            return self._sfx_analysis()
+        return self._analyze_from_text(
+            fallback_text, BubbleGeom.from_box(bubble_box, page_height)
+        )
 
     def _analysis_from_metadata(self, entry: VisionTextEntry) -> CharacterAnalysis | None:
         gender = (entry.speaker_gender or "unknown").lower()
@@ -236,13 +1005,18 @@ class VisionService:
         tone = (entry.tone or "normal").lower()
 
         voice_key = self._map_voice_key(gender, age, bubble_type)
-        voice_id = self.VOICE_MAPPING.get(voice_key, self.VOICE_MAPPING["narrator"])
+        voice_id = _VOICE_MAPPING.get(voice_key, _VOICE_MAPPING["narrator"])
         stability, similarity, style = self._emotion_to_settings(emotion)
 
         character_label = bubble_type or f"{gender}_{age or 'unknown'}"
-        print(
-            f"🎭 Vision metadata: type={character_label} gender={gender} age={age} "
-            f"emotion={emotion} → {voice_id} (stability={stability})"
+        logger.debug(
+            "🎭 Vision metadata: type=%s gender=%s age=%s emotion=%s → %s (stability=%s)",
+            character_label,
+            gender,
+            age,
+            emotion,
+            voice_id,
+            stability,
         )
 
         return CharacterAnalysis(
@@ -256,58 +1030,10 @@ class VisionService:
         )
 
     def _map_voice_key(self, gender: str, age: str, bubble_type: str) -> str:
-        if bubble_type in {"system", "ui", "computer", "hud"}:
-            return "system"
-        if bubble_type in {"sfx", "fx", "effect", "sound"}:
-            return "sfx"
-        if bubble_type in {"narration", "narrator"}:
-            return "narrator"
-
-        if gender == "male":
-            if any(keyword in age for keyword in ("child", "kid", "boy")):
-                return "child_male"
-            if any(keyword in age for keyword in ("teen", "young", "youth")):
-                return "young_male"
-            return "adult_male"
-
-        if gender == "female":
-            if any(keyword in age for keyword in ("child", "kid", "girl")):
-                return "child_female"
-            if any(keyword in age for keyword in ("teen", "young", "youth")):
-                return "young_female"
-            return "adult_female"
-
-        # Unknown gender: infer from bubble type or default to young female
-        if bubble_type in {"thought"}:
-            return "young_female"
-        if bubble_type in {"sfx"}:
-            return "narrator"
-        return "young_female"
+        return _voice_key_for(gender, age, bubble_type)
 
     def _emotion_to_settings(self, emotion: str) -> tuple[float, float, float]:
-        emotion = emotion.lower()
-        stability = 0.5
-        similarity = 0.75
-        style = 0.2
-        
-        if emotion in {"angry", "furious", "excited", "ecstatic"}:
-            stability = 0.22
-            similarity = 0.68
-            style = 0.85
-        elif emotion in {"happy", "playful", "amused"}:
-            stability = 0.35
-            similarity = 0.75
-            style = 0.6
-        elif emotion in {"sad", "melancholy", "serious", "calm"}:
-            stability = 0.65
-            similarity = 0.82
-            style = 0.35
-        elif emotion in {"scared", "nervous", "anxious"}:
-            stability = 0.4
-            similarity = 0.72
-            style = 0.55
-        
-        return stability, similarity, style
+        return _emotion_settings(emotion)
 
     def _parse_detected_entries(self, content: str) -> list[VisionTextEntry]:
         if not content:
@@ -319,10 +1045,12 @@ class VisionService:
         
         normalized = self._strip_code_fences(content)
         parsed: Any | None = None
-        try:
-            parsed = json.loads(normalized)
-        except json.JSONDecodeError:
-            parsed = None
+        # Bullet and numbered replies never parse; skip the raise-and-catch for them
+        if normalized[:1] in _JSON_START_CHARS:
+            try:
+                parsed = _json_loads(normalized)
+            except ValueError:  # json and orjson decode errors both subclass ValueError
+                parsed = None
         
         if parsed is not None:
             entries = self._extract_entries_from_structure(parsed)
@@ -335,26 +1063,25 @@ class VisionService:
         return [VisionTextEntry(text=text) for text in fallback_texts]
     
     def _extract_entries_from_structure(self, data) -> list[VisionTextEntry]:
-        if isinstance(data, list):
-            entries: list[VisionTextEntry] = []
-            for item in data:
-                entries.extend(self._extract_entries_from_structure(item))
-            return entries
-        
-        if isinstance(data, dict):
-            entry = self._entry_from_dict(data)
-            if entry:
-                return [entry]
-            entries: list[VisionTextEntry] = []
-            for value in data.values():
-                entries.extend(self._extract_entries_from_structure(value))
-            return entries
-        
-        if isinstance(data, str):
-            text = data.strip()
-            if text:
-                return [VisionTextEntry(text=text)]
-        return []
+        # Depth-first with an explicit stack (children pushed reversed to keep
+        # document order), so deeply nested replies cannot hit the recursion limit
+        entries: list[VisionTextEntry] = []
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(reversed(node))
+            elif isinstance(node, dict):
+                entry = self._entry_from_dict(node)
+                if entry:
+                    entries.append(entry)
+                else:
+                    stack.extend(reversed(node.values()))
+            elif isinstance(node, str):
+                text = node.strip()
+                if text:
+                    entries.append(VisionTextEntry(text=text))
+        return entries
     
     def _entry_from_dict(self, data: dict) -> VisionTextEntry | None:
         text_value = data.get("text") or data.get("content")
@@ -393,19 +1120,6 @@ class VisionService:
         return None
     
     def _split_plain_text(self, content: str) -> list[str]:
-        lines = content.replace("\r", "\n").split("\n")
-        cleaned_lines: list[str] = []
-        for raw_line in lines:
-            line = raw_line.strip()
-            if not line:
-                cleaned_lines.append("")
-                continue
-            line = line.strip("-•*> ")
-            line = re.sub(r"^\d+[\)\.:-]\s*", "", line)
-            line = re.sub(r"(?i)^(bubble|panel|text|speech)\s*\d*\s*[:\-]\s*", "", line).strip()
-            line = self._strip_metadata_from_line(line)
-            cleaned_lines.append(line)
-        
         bubbles: list[str] = []
         buffer: list[str] = []
         
@@ -416,7 +1130,17 @@ class VisionService:
                     bubbles.append(joined)
                 buffer.clear()
         
-        for line in cleaned_lines:
+        # Clean and group in one pass; the prefix regexes only run when the
+        # first character could start a match
+        for raw_line in content.replace("\r", "\n").split("\n"):
+            line = raw_line.strip()
+            if line:
+                line = line.strip("-•*> ")
+                if line[:1].isdigit():
+                    line = _LIST_PREFIX_RE.sub("", line)
+                if line[:1].casefold() in _BUBBLE_PREFIX_INITIALS:
+                    line = _BUBBLE_PREFIX_RE.sub("", line)
+                line = self._strip_metadata_from_line(line.strip())
             if not line:
                 _flush_buffer()
                 continue
@@ -425,7 +1149,7 @@ class VisionService:
                 bubbles.append(line.strip(" \"“”"))
                 continue
             buffer.append(line)
-            if line.endswith(tuple(".?!…\"”")):
+            if line.endswith(_BUBBLE_END_CHARS):
                 _flush_buffer()
         _flush_buffer()
         
@@ -437,33 +1161,14 @@ class VisionService:
         if not line:
             return ""
         
-        text_match = re.search(r"(?i)text\s*[:=]\s*(.+)", line)
+        text_match = _TEXT_KV_RE.search(line)
         if text_match:
             candidate = text_match.group(1).strip()
             candidate = candidate.strip(" \"“”'")
             return candidate
         
-        meta_fields = [
-            "speaker gender",
-            "speaker_gender",
-            "gender",
-            "speaker age",
-            "speaker_age",
-            "age",
-            "bubble type",
-            "bubble_type",
-            "emotion",
-            "tone",
-        ]
-        for field in meta_fields:
-            pattern = (
-                r"(?i)\b"
-                + re.escape(field)
-                + r"\b\s*(?:[:=\-]\s*)?(?:\"[^\"]*\"|'[^']*'|[A-Za-z ]+)"
-            )
-            line = re.sub(pattern, "", line)
-        
-        line = re.sub(r"\s{2,}", " ", line)
+        line = _META_RE.sub("", line)
+        line = _MULTI_SPACE_RE.sub(" ", line)
         return line.strip(" ,;:-\"“”'")
 
     def _strip_code_fences(self, content: str) -> str:
@@ -486,74 +1191,84 @@ class VisionService:
         compact = cleaned.replace(" ", "")
         if len(compact) > 20:
             return False
-        letters = [char for char in cleaned if char.isalpha()]
-        if not letters:
+        letter_count, upper_count = letter_case_counts(cleaned)
+        if not letter_count or upper_count / letter_count < 0.7:
             return False
-        uppercase_ratio = sum(1 for char in letters if char.isupper()) / len(letters)
-        keywords = {
-            "boom",
-            "bang",
-            "pow",
-            "wham",
-            "slam",
-            "crash",
-            "clang",
-            "clank",
-            "snap",
-            "whoosh",
-            "thud",
-            "zap",
-            "kaboom",
-            "zing",
-        }
-        tokens = [token for token in re.split(r"[^a-zA-Z]+", cleaned.lower()) if token]
-        keyword_match = any(token in keywords for token in tokens)
-        punctuation_heavy = bool(re.fullmatch(r"[A-Z0-9!?~\\-]+", compact))
-        repeated_letters = bool(re.search(r"(.)\1{2,}", compact))
-        return uppercase_ratio >= 0.7 and (keyword_match or punctuation_heavy or repeated_letters)
+        if self._has_sfx_keyword(cleaned):
+            return True
+        return bool(_SFX_PUNCT_RE.fullmatch(compact) or _REPEATED_RE.search(compact))
 
-    def _infer_gender_from_text(self, text: str) -> str | None:
-        """Heuristic gender detection from pronouns and honorifics."""
-        padded = f" {text} "
-        male_tokens = [
-            " he ",
-            " his ",
-            " him ",
-            " sir ",
-            " lord ",
-            " mr.",
-            " brother ",
-            " dad ",
-            " father ",
-            " king ",
-            " dude ",
-            " bro ",
-            " man ",
-        ]
-        female_tokens = [
-            " she ",
-            " her ",
-            " hers ",
-            " ma'am",
-            " lady ",
-            " miss ",
-            " mrs.",
-            " sister ",
-            " mom ",
-            " mother ",
-            " queen ",
-            " girl ",
-        ]
-        if any(token in padded for token in male_tokens):
-            return "male"
-        if any(token in padded for token in female_tokens):
-            return "female"
-        return None
+    def _has_sfx_keyword(self, text: str) -> bool:
+        return not _SFX_KEYWORDS.isdisjoint(_NON_ALPHA_RE.split(text.lower()))
 
-    def _encode_image(self, image) -> str:
-        buffered = io.BytesIO()
-        image.save(buffered, format="PNG")
-        return base64.b64encode(buffered.getvalue()).decode()
+    def _infer_gender_from_text(self, text: str) -> str | None:
+        return _infer_gender(text)
+
+    def load_page(self, image_path: Path, *, reduced: bool = False) -> Image.Image:
+        """Decoded page image, shared across slices and bubble crops of the same file.
+
+        ``reduced`` returns a copy that JPEG sources may decode at a
+        fraction of full size; crop it with _segment_crop, not page coordinates.
+        """
+        return _load_page_cached(str(image_path), image_path.stat().st_mtime_ns, reduced)
+
+    def page_size(self, image_path: Path) -> tuple[int, int]:
+        """(width, height) of a page read from the file header, without decoding pixels."""
+        with Image.open(image_path) as image:
+            return image.size
+
+    def _segment_crop(
+        self, image: Image.Image, height: int, start_y: int, end_y: int
+    ) -> Image.Image:
+        """Crop a full-width slice given in page coordinates from a possibly reduced image."""
+        ratio = image.height / height
+        return image.crop((0, round(start_y * ratio), image.width, round(end_y * ratio)))
+
+    def _encode_image(self, image, max_dim: int | None = None) -> str:
+        # The vision model downsamples anyway; a bounded image is far smaller to upload
+        png = _IMAGE_FORMAT == "png"
+        prepared = image if png or image.mode in ("RGB", "L") else image.convert("RGB")
+        max_dim = max_dim or settings.vision_max_dim
+        if max(prepared.size) > max_dim:
+            # resize() writes straight into the smaller image; thumbnail() would
+            # need a full-size copy first to leave the cached page untouched
+            scale = max_dim / max(prepared.size)
+            prepared = prepared.resize(
+                (max(1, round(prepared.width * scale)), max(1, round(prepared.height * scale))),
+                Image.Resampling.LANCZOS,
+                reducing_gap=2.0,
+            )
+        if png:
+            return _save_and_b64encode(prepared, format="PNG")
+        if _TURBOJPEG is not None:
+            # Encode straight from the pixel buffer with the same quality and
+            # 4:2:0 chroma subsampling as Pillow's encoder
+            gray = prepared.mode == "L"
+            return _b64encode_str(
+                _TURBOJPEG.encode(
+                    np.asarray(prepared),
+                    quality=85,
+                    pixel_format=TJPF_GRAY if gray else TJPF_RGB,
+                    jpeg_subsample=TJSAMP_GRAY if gray else TJSAMP_420,
+                )
+            )
+        return _save_and_b64encode(prepared, format="JPEG", quality=85)
+
+    def _encode_crop(
+        self, image: Image.Image, bubble_box: list[int], max_dim: int = BUBBLE_MAX_DIM
+    ) -> str:
+        """Crop one padded bubble from a decoded page and encode it within ``max_dim``."""
+        crop = image.crop(
+            (
+                max(0, bubble_box[0] - CROP_PADDING),
+                max(0, bubble_box[1] - CROP_PADDING),
+                min(image.width, bubble_box[2] + CROP_PADDING),
+                min(image.height, bubble_box[3] + CROP_PADDING),
+            )
+        )
+        if crop.width * crop.height > BUBBLE_FULL_RES_AREA:
+            max_dim = min(max_dim, REGION_MAX_DIM)
+        return self._encode_image(crop, max_dim=max_dim)
 
     def _run_segment_pipeline(
         self,
@@ -564,73 +1279,186 @@ class VisionService:
         single_pass: bool = False,
     ) -> list[tuple[list[int], str, CharacterAnalysis]]:
         segments = (
-            [(0, height)] if single_pass else self._segment_vertical_ranges(height)
+            [(0, height)]
+            if single_pass
+            else self._segment_vertical_ranges(height, image=image)
         )
-        prompt = (
-            "You are an expert manga letterer and voice director. "
-            "Look at the ENTIRE page and extract EVERY readable text element: speech bubbles, narration boxes, "
-            "system/U.I. panels, glowing screens, and sound effects. "
-            "Return results in reading order (top-to-bottom, left-to-right) as STRICT JSON (no narration outside JSON). "
-            "Each entry must be an object with: "
-            '{"text":"..." , "speaker_gender":"male|female|unknown", '
-            '"speaker_age":"child|teen|young adult|adult", '
-            '"emotion":"happy|sad|angry|scared|serious|neutral", '
-            '"tone":"playful|serious|questioning|dramatic|neutral", '
-            '"bubble_type":"dialogue|thought|narration|system|sfx" }.'
-        )
-
-        print(
-            f"🧩 Vision segmentation: {len(segments)} slice(s) for page height {height}px "
-            f"(single_pass={single_pass})"
+        segments = self._informative_segments(image, height, segments)
+        if not segments:
+            logger.info("🧩 Page height %dpx is blank; skipping vision call", height)
+            return []
+        logger.info(
+            "🧩 Vision segmentation: %d slice(s) for page height %dpx (single_pass=%s)",
+            len(segments),
+            height,
+            single_pass,
         )
 
-        bubbles: list[tuple[list[int], str, CharacterAnalysis]] = []
-        seen_signatures: set[tuple[str, int]] = set()
-        total_entries = 0
-
         def run_segment(
             seg_index: int,
             total_segments: int,
             start_y: int,
             end_y: int,
             img_base64: str,
-        ) -> tuple[int, int, int, str | None]:
-            segment_prompt = prompt
-            if total_segments > 1:
-                segment_prompt += (
-                    f" You are looking only at segment {seg_index} of {total_segments}, "
-                    f"covering vertical pixels {start_y} through {end_y}. "
-                    "Focus on text inside this slice only."
-                )
+        ) -> _SegmentJob:
+            segment_prompt = self._segment_prompt(
+                seg_index, total_segments, start_y, end_y
+            )
             segment_height = end_y - start_y
-            print(
-                f"🤖 Calling GPT-4o-mini for slice {seg_index}/{total_segments} "
-                f"(height {segment_height}px)"
+            logger.debug(
+                "🤖 Calling GPT-4o-mini for slice %d/%d (height %dpx)",
+                seg_index,
+                total_segments,
+                segment_height,
             )
-            content = self._call_openai(segment_prompt, img_base64, max_tokens=700)
+            content: str | list[VisionTextEntry]
+            if settings.vision_stream_responses:
+                content = self._stream_segment_entries(segment_prompt, img_base64, 700)
+            else:
+                content = self._call_openai(
+                    segment_prompt,
+                    img_base64,
+                    max_tokens=700,
+                    cache_if=lambda reply: bool(self._parse_detected_entries(reply)),
+                )
             if not content:
-                print(f"⚠️ Vision API returned no text for slice {seg_index}")
+                logger.warning("⚠️ Vision API returned no text for slice %d", seg_index)
             else:
-                print(f"📝 Vision response (slice {seg_index}):\n{content}")
+                logger.debug("📝 Vision response (slice %d):\n%s", seg_index, content)
             return seg_index, start_y, end_y, content
 
-        segment_jobs: list[tuple[int, int, int, str | None]] = []
-        for seg_index, (start_y, end_y) in enumerate(segments, start=1):
-            crop = image.crop((0, start_y, width, end_y))
-            img_base64 = self._encode_image(crop)
-            segment_jobs.append(
-                run_segment(seg_index, len(segments), start_y, end_y, img_base64)
+        # Encode each slice once; the per-slice fallback reuses the combined call's images
+        encoded = [
+            self._encode_image(self._segment_crop(image, height, start_y, end_y))
+            for start_y, end_y in segments
+        ]
+
+        if settings.vision_combined_slices and len(segments) > 1:
+            segment_jobs = self._run_combined_segments(segments, encoded)
+            if segment_jobs is not None:
+                return self._bubbles_from_segment_contents(segment_jobs, width, height)
+            logger.warning(
+                "⚠️ Combined vision response was incomplete; retrying slices individually"
+            )
+
+        # Slices are independent network calls, so issue them concurrently
+        max_workers = max(1, min(MAX_PARALLEL_SLICES, len(segments)))
+        segment_jobs: list[_SegmentJob] = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for seg_index, ((start_y, end_y), img_base64) in enumerate(
+                zip(segments, encoded), start=1
+            ):
+                futures.append(
+                    executor.submit(
+                        run_segment, seg_index, len(segments), start_y, end_y, img_base64
+                    )
+                )
+            for future in as_completed(futures):
+                segment_jobs.append(future.result())
+
+        return self._bubbles_from_segment_contents(segment_jobs, width, height)
+
+    def _run_combined_segments(
+        self,
+        segments: list[tuple[int, int]],
+        encoded: list[str],
+    ) -> list[_SegmentJob] | None:
+        """Send every slice in one request so the prompt is only prefilled once.
+
+        Returns None when the reply cannot be split back into one result per
+        slice (usually a truncated response) so the caller can fall back to
+        per-slice calls.
+        """
+        total = len(segments)
+        content: list[dict[str, str]] = []
+        for seg_index, ((start_y, end_y), img_base64) in enumerate(
+            zip(segments, encoded), start=1
+        ):
+            content.append(
+                {
+                    "type": "input_text",
+                    "text": f"--- SEGMENT {seg_index} (y=[{start_y},{end_y}]) ---",
+                }
+            )
+            content.append(
+                {
+                    "type": "input_image",
+                    "image_url": f"data:{_IMAGE_MIME};base64,{img_base64}",
+                }
+            )
+
+        instructions = _COMBINED_PROMPT_TMPL.format_map({"total": total})
+        cache_key = _RESPONSE_CACHE.key(
+            _VISION_MODEL,
+            instructions,
+            700 * total,
+            *(part.get("text") or part["image_url"] for part in content),
+        )
+        reply = _RESPONSE_CACHE.get(cache_key)
+        from_cache = reply is not None
+        if from_cache:
+            logger.debug("♻️ Combined vision reply served from cache")
+        else:
+            logger.debug("🤖 Calling GPT-4o-mini once for %d slices", total)
+            reply = self._post_openai(
+                self._payload_from_content(content, 700 * total, instructions=instructions)
+            )
+        if not reply:
+            return None
+        try:
+            parsed = _json_loads(self._strip_code_fences(reply))
+        except ValueError:
+            return None
+        per_segment = parsed.get("segments") if isinstance(parsed, dict) else parsed
+        if not isinstance(per_segment, list) or len(per_segment) != total:
+            return None
+        if not from_cache:
+            # Only replies that split into one result per slice are worth replaying
+            _RESPONSE_CACHE.set(cache_key, reply)
+
+        return [
+            (seg_index, start_y, end_y, self._extract_entries_from_structure(entries))
+            for seg_index, ((start_y, end_y), entries) in enumerate(
+                zip(segments, per_segment), start=1
             )
+        ]
 
-        segment_jobs.sort(key=lambda item: item[0])
+    def _segment_prompt(
+        self, seg_index: int, total_segments: int, start_y: int, end_y: int
+    ) -> str:
+        if total_segments <= 1:
+            return _PAGE_PROMPT
+        return _SEGMENT_PROMPT_TMPL.format_map(
+            {
+                "index": seg_index,
+                "total": total_segments,
+                "start": start_y,
+                "end": end_y,
+            }
+        )
 
+    def _bubbles_from_segment_contents(
+        self,
+        segment_jobs: list[_SegmentJob],
+        width: int,
+        height: int,
+    ) -> list[tuple[list[int], str, CharacterAnalysis]]:
+        """Parse per-slice vision responses into page-space bubbles, in slice order."""
+        bubbles: list[tuple[list[int], str, CharacterAnalysis]] = []
+        seen_signatures: set[tuple[str, int]] = set()
+        total_entries = 0
+
+        segment_jobs = sorted(segment_jobs, key=lambda item: item[0])
         for seg_index, start_y, end_y, content in segment_jobs:
             if not content:
                 continue
             segment_height = end_y - start_y
-            entries = self._parse_detected_entries(content)
+            entries = (
+                content if isinstance(content, list) else self._parse_detected_entries(content)
+            )
             if not entries:
-                print(f"⚠️ Could not parse text entries for slice {seg_index}")
+                logger.warning("⚠️ Could not parse text entries for slice %d", seg_index)
                 continue
 
             slice_boxes = self._approximate_bubble_boxes(
@@ -661,41 +1489,102 @@ class VisionService:
                 )
                 bubbles.append((adjusted_box, text, analysis))
                 total_entries += 1
-                print(
-                    f"✨ Vision detected text #{total_entries}: {text[:60]} "
-                    f"(slice {seg_index})"
+                logger.debug(
+                    "✨ Vision detected text #%d: %s (slice %d)",
+                    total_entries,
+                    text[:60],
+                    seg_index,
                 )
 
         if not bubbles:
-            print("⚠️ Vision API did not return any usable text entries")
+            logger.warning("⚠️ Vision API did not return any usable text entries")
         else:
-            print(
-                f"✨ Vision API found {total_entries} text elements across {len(segments)} slice(s)"
+            logger.info(
+                "✨ Vision API found %d text elements across %d slice(s)",
+                total_entries,
+                len(segment_jobs),
             )
 
         return bubbles
 
     def _segment_vertical_ranges(
-        self, height: int, max_height: int = 2600, overlap: int = 900
+        self,
+        height: int,
+        max_height: int = 2600,
+        overlap: int = 900,
+        image: Image.Image | None = None,
     ) -> list[tuple[int, int]]:
-        """Split tall/scrolling pages into overlapping slices for better OCR."""
+        """Split tall/scrolling pages into overlapping slices for better OCR.
+
+        With ``image``, a slice ends inside a blank gutter near its bottom when
+        there is one; nothing can straddle such a cut, so the next slice only
+        needs a token overlap instead of the defensive one.
+        """
         if height <= max_height:
             return [(0, height)]
 
         overlap = min(overlap, max_height // 2)
+        safe_rows = self._find_safe_split_points(image, height) if image is not None else []
 
         ranges: list[tuple[int, int]] = []
         start = 0
         while start < height:
             end = min(height, start + max_height)
+            step_back = overlap
+            if end < height:
+                last_safe = bisect_right(safe_rows, end) - 1
+                # Only take a gutter that advances at least as far as the overlapping
+                # cut would, so safe splits never add slices
+                earliest = start + max_height - overlap + SAFE_SPLIT_OVERLAP
+                if last_safe >= 0 and safe_rows[last_safe] >= earliest:
+                    end = safe_rows[last_safe]
+                    step_back = SAFE_SPLIT_OVERLAP
             ranges.append((start, end))
             if end >= height:
                 break
-            start = max(0, end - overlap)
+            start = max(0, end - step_back)
         return ranges
 
+    def _find_safe_split_points(self, image: Image.Image, height: int) -> list[int]:
+        """Page rows in the middle of full-width blank bands (panel gutters), ascending."""
+        # Rows only need to be compared across their width, so squeeze it first
+        narrow = image.convert("L").resize(
+            (min(image.width, 256), image.height), Image.Resampling.BOX
+        )
+        blank = np.ptp(np.asarray(narrow), axis=1) < BLANK_SLICE_RANGE
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], blank.view(np.int8), [0]))))
+        ratio = height / image.height
+        min_rows = max(1, round(SAFE_SPLIT_MIN_BAND / ratio))
+        return [
+            round((band_start + band_end) / 2 * ratio)
+            for band_start, band_end in zip(edges[::2], edges[1::2])
+            if band_end - band_start >= min_rows
+        ]
+
+    def _informative_segments(
+        self, image: Image.Image, height: int, segments: list[tuple[int, int]]
+    ) -> list[tuple[int, int]]:
+        """Drop blank gutter slices and slices identical to one already kept."""
+        kept: list[tuple[int, int]] = []
+        seen_hashes: set[tuple[int, int, bytes]] = set()
+        for start_y, end_y in segments:
+            crop = self._segment_crop(image, height, start_y, end_y).convert("L")
+            low, high = crop.getextrema()
+            if high - low < BLANK_SLICE_RANGE:
+                logger.debug("⏭️ Skipping blank slice y=%d-%d", start_y, end_y)
+                continue
+            # Only pixel-identical slices are repeats: a thumbnail fingerprint also
+            # matched slices with different short captions on the same background
+            digest = crop.size + (hashlib.blake2b(crop.tobytes(), digest_size=16).digest(),)
+            if digest in seen_hashes:
+                logger.debug("⏭️ Skipping duplicate slice y=%d-%d", start_y, end_y)
+                continue
+            seen_hashes.add(digest)
+            kept.append((start_y, end_y))
+        return kept
+
     def _entry_signature(self, text: str, box: list[int]) -> tuple[str, int]:
-        normalized = re.sub(r"\s+", " ", text.strip().lower())
+        normalized = _WHITESPACE_RE.sub(" ", text.strip().lower())
         center_y = (box[1] + box[3]) // 2
         bucket = center_y // 60
         return normalized, bucket
@@ -714,41 +1603,33 @@ class VisionService:
         available_height = max(100, height - top_margin - bottom_margin)
         slot_height = max(140, int(available_height / max(1, count)))
         
-        boxes: list[list[int]] = []
-        for idx in range(count):
-            top = top_margin + idx * slot_height
-            bottom = top + slot_height - int(slot_height * 0.2)
-            if bottom > height - bottom_margin:
-                bottom = height - bottom_margin
-            if bottom - top < 80:
-                bottom = top + 80
-            boxes.append(
-                [
-                    left_margin,
-                    max(0, top),
-                    right_margin,
-                    min(height, bottom),
-                ]
-            )
-        return boxes
+        tops = top_margin + np.arange(count, dtype=np.int64) * slot_height
+        bottoms = np.minimum(
+            tops + slot_height - int(slot_height * 0.2), height - bottom_margin
+        )
+        bottoms = np.where(bottoms - tops < 80, tops + 80, bottoms)
+        boxes = np.empty((count, 4), dtype=np.int64)
+        boxes[:, 0] = left_margin
+        boxes[:, 1] = np.maximum(tops, 0)
+        boxes[:, 2] = right_margin
+        boxes[:, 3] = np.minimum(bottoms, height)
+        return boxes.tolist()
 
     def _detect_bubble_boxes_local(
         self,
-        image_path: Path,
+        source: Path | Image.Image,
         page_width: int,
         page_height: int,
     ) -> list[list[int]]:
         if not self._local_detector:
             return []
+        # PaddleOCR takes a path or an OpenCV-style BGR array
+        image = str(source) if isinstance(source, Path) else np.asarray(source)[:, :, ::-1]
         try:
-            detections = self._local_detector.ocr(
-                str(image_path),
-                det=True,
-                rec=False,
-                cls=False,
-            )
+            with self._local_detector_lock:
+                detections = self._local_detector.ocr(image, det=True, rec=False, cls=False)
         except Exception as exc:  # pragma: no cover - detector edge
-            print(f"⚠️ Local detector failed: {exc}")
+            logger.warning("⚠️ Local detector failed: %s", exc)
             return []
 
         if not detections:
@@ -807,7 +1688,7 @@ class VisionService:
         merged = list(primary)
 
         def normalize(text: str) -> str:
-            return re.sub(r"\s+", " ", text.strip().lower())
+            return _WHITESPACE_RE.sub(" ", text.strip().lower())
 
         for candidate_box, candidate_text, candidate_analysis in secondary:
             norm_candidate = normalize(candidate_text)
@@ -844,180 +1725,150 @@ class VisionService:
 
     def _transcribe_local_boxes(
         self,
-        image_path: Path,
+        image: Image.Image,
         boxes: list[list[int]],
         page_height: int | float | None,
     ) -> list[tuple[list[int], str, CharacterAnalysis]]:
         if not boxes:
             return []
-        try:
-            from PIL import Image
 
-            image = Image.open(image_path)
-        except Exception as exc:  # pragma: no cover - IO edge
-            print(f"⚠️ Could not open image for local transcription: {exc}")
-            return []
-
-        prompt = (
-            "Transcribe this manga speech bubble exactly as written. Preserve punctuation, "
-            "question marks, ellipses, shouting, and casing. Return ONLY the text."
-        )
-        results: list[tuple[list[int], str, CharacterAnalysis]] = []
+        crops: list[tuple[list[int], str]] = []
         for idx, bubble_box in enumerate(boxes, start=1):
-            crop = image.crop((bubble_box[0], bubble_box[1], bubble_box[2], bubble_box[3]))
-            if crop.width < 12 or crop.height < 12:
+            if bubble_box[2] - bubble_box[0] < 12 or bubble_box[3] - bubble_box[1] < 12:
                 continue
-            img_base64 = self._encode_image(crop)
-            print(f"🧩 Local crop #{idx}: {bubble_box}")
-            text = self._call_openai(prompt, img_base64, max_tokens=220)
+            logger.debug("🧩 Local crop #%d: %s", idx, bubble_box)
+            crops.append((bubble_box, self._encode_crop(image, bubble_box)))
+
+        texts = _run_sync(self._transcribe_crops_async([img for _, img in crops]))
+
+        results: list[tuple[list[int], str, CharacterAnalysis]] = []
+        for (bubble_box, _), text in zip(crops, texts):
             if not text:
                 continue
-            text = text.replace("\n", " ").replace("  ", " ").strip()
-            analysis = self._analyze_from_text(text, bubble_box, page_height)
+            text = _single_line(text)
+            analysis = self._analyze_from_text(text, BubbleGeom.from_box(bubble_box, page_height))
             results.append((bubble_box, text, analysis))
-        image.close()
         return results
 
-    def _analyze_from_text(
-        self,
-        text: str,
-        bubble_box: list[int],
-        page_height: int | float | None,
-    ) -> CharacterAnalysis:
-        """Analyze text content to determine character type and emotion."""
-        
-        text_lower = text.lower()
-        # Detect emotion from text patterns
-        emotion = "neutral"
-        tone = "normal"
-        stability = 0.5
-        
-        # Question marks suggest confusion/uncertainty
-        if "?" in text:
-            if "...?" in text or "??" in text:
-                emotion = "confused"
-                tone = "questioning"
-                stability = 0.3  # More expressive
-            else:
-                tone = "questioning"
-                stability = 0.4
-        
-        # Exclamation marks suggest excitement/anger
-        if "!" in text:
-            if "!!" in text or "!!!" in text:
-                emotion = "excited" if len(text) < 50 else "angry"
-                tone = "dramatic"
-                stability = 0.2  # Very expressive
-            else:
-                emotion = "assertive"
-                tone = "emphatic"
-                stability = 0.35
-        
-        # Ellipsis suggests thoughtfulness/uncertainty
-        if "..." in text:
-            emotion = "thoughtful"
-            tone = "contemplative"
-            stability = 0.4
-        
-        # Keyword patterns for voice selection
-        system_keywords = ["you are now", "system", "quest", "mission", "objective", "status"]
-        warrior_keywords = ["knight", "iron", "blood", "sword", "battle", "fight", "warrior", "soldier"]
-        adult_male_keywords = ["sir", "captain", "commander", "master", "lord", "king"]
-        young_male_keywords = ["bro", "dude", "hey", "yeah", "whoa"]
-        child_keywords = ["mom", "mommy", "dad", "daddy", "scared", "wanna", "gonna"]
-        elegant_keywords = ["grace", "beauty", "elegant", "lovely", "delicate"]
-        wise_keywords = ["ancient", "wisdom", "elder", "sage", "experience"]
-
-        voice_archetype = "narrator"
-        
-        # Check for system messages
-        has_system_keywords = any(keyword in text_lower for keyword in system_keywords)
-        has_warrior_keywords = any(keyword in text_lower for keyword in warrior_keywords)
-        has_child_keywords = any(keyword in text_lower for keyword in child_keywords)
-        
-        # All-caps dialogue is common in manga, so only treat as system if it has system keywords
-        is_system_message = has_system_keywords and not has_warrior_keywords
-
-        # Determine age group and gender
-        if is_system_message:
-            voice_archetype = "system"
-            stability = max(stability, 0.65)
-        elif has_child_keywords:
-            # Child voice - determine gender from other context
-            if any(keyword in text_lower for keyword in ["boy", "son", "he", "him", "his"]):
-                voice_archetype = "child_male"
-            else:
-                voice_archetype = "child_female"
-            stability = 0.35  # Children are more expressive
-        elif has_warrior_keywords or any(keyword in text_lower for keyword in adult_male_keywords):
-            # Adult male voice for warriors/authority figures
-            voice_archetype = "adult_male"
-        elif any(keyword in text_lower for keyword in young_male_keywords):
-            # Young male voice
-            voice_archetype = "young_male"
-        elif any(keyword in text_lower for keyword in wise_keywords + elegant_keywords):
-            # Mature female voice for wise/elegant characters
-            voice_archetype = "adult_female"
-        elif len(text) < 30 and "?" in text:
-            # Short questions often from younger characters
-            voice_archetype = "young_female"
-        else:
-            # Default to young adult based on emotion
-            if emotion in {"excited", "assertive"}:
-                voice_archetype = "young_male"
-            else:
-                voice_archetype = "young_female"
+    async def _transcribe_crops_async(self, images: list[str]) -> list[str]:
+        """Transcribe encoded bubble crops concurrently, in input order.
 
-        gender_hint = self._infer_gender_from_text(text_lower)
-        if not is_system_message and gender_hint:
-            if gender_hint == "male":
-                if has_child_keywords:
-                    voice_archetype = "child_male"
-                elif has_warrior_keywords or len(text) > 70 or "sir" in text_lower:
-                    voice_archetype = "adult_male"
-                else:
-                    voice_archetype = "young_male"
-            elif gender_hint == "female":
-                if has_child_keywords:
-                    voice_archetype = "child_female"
-                elif len(text) > 70 or "lady" in text_lower or "madam" in text_lower:
-                    voice_archetype = "adult_female"
-                else:
-                    voice_archetype = "young_female"
+        Identical crops are sent once, and crops already transcribed on an
+        earlier page or run are answered from the reply cache.
+        """
+        keys = {
+            img: _RESPONSE_CACHE.key(_VISION_MODEL, "bubble-crop", img)
+            for img in dict.fromkeys(images)
+        }
+        cached = await asyncio.to_thread(_RESPONSE_CACHE.get_many, list(keys.values()))
+        texts = {img: text for img, text in zip(keys, cached) if text is not None}
+        pending = [img for img in keys if img not in texts]
+        if len(pending) < len(images):
+            logger.debug(
+                "♻️ %d of %d bubble crops deduplicated or cached",
+                len(images) - len(pending),
+                len(images),
+            )
+        if pending:
+            fresh = dict(zip(pending, await self._transcribe_unique_crops_async(pending)))
+            await asyncio.to_thread(
+                _RESPONSE_CACHE.set_many,
+                {keys[img]: text for img, text in fresh.items() if text.strip()},
+            )
+            texts.update(fresh)
+        return [texts[img] for img in images]
+
+    async def _transcribe_unique_crops_async(self, images: list[str]) -> list[str]:
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_BUBBLES)
+        async with httpx.AsyncClient(
+            http2=_HTTP2,
+            timeout=60,
+            limits=httpx.Limits(max_connections=MAX_PARALLEL_BUBBLES),
+        ) as client:
+
+            async def transcribe(img_base64: str) -> str:
+                async with semaphore:
+                    return await self._call_openai_async(
+                        client, _TRANSCRIBE_PROMPT, img_base64, max_tokens=220, detail="low"
+                    )
+
+            async def transcribe_group(group: list[str]) -> list[str]:
+                if len(group) > 1:
+                    async with semaphore:
+                        texts = await self._transcribe_group_async(client, group)
+                    if texts is not None:
+                        return texts
+                    logger.warning(
+                        "⚠️ Batched bubble reply did not match %d crops; "
+                        "transcribing them individually",
+                        len(group),
+                    )
+                return await asyncio.gather(*(transcribe(img) for img in group))
+
+            groups = await asyncio.gather(
+                *(
+                    transcribe_group(images[start : start + BUBBLE_BATCH_SIZE])
+                    for start in range(0, len(images), BUBBLE_BATCH_SIZE)
+                )
+            )
+            return [text for group in groups for text in group]
+
+    async def _transcribe_group_async(
+        self, client: httpx.AsyncClient, images: list[str]
+    ) -> list[str] | None:
+        """Transcribe several bubble crops in one request, in input order.
+
+        Returns None when the reply is not one string per crop so the caller
+        can fall back to per-bubble calls.
+        """
+        total = len(images)
+        content: list[dict[str, str]] = []
+        for index, img_base64 in enumerate(images, start=1):
+            content.append({"type": "input_text", "text": f"--- BUBBLE {index} ---"})
+            content.append(
+                {
+                    "type": "input_image",
+                    "image_url": f"data:{_IMAGE_MIME};base64,{img_base64}",
+                    "detail": "low",
+                }
+            )
 
-        # If the bubble sits in the top ~15% of the page and looks like UI text, treat as system
-        effective_height = (
-            page_height
-            if page_height and page_height > 0
-            else (bubble_box[3] if len(bubble_box) > 3 else bubble_box[1] + 100)
+        logger.debug("🤖 Calling GPT-4o-mini once for %d bubbles", total)
+        reply = await self._post_openai_async(
+            client,
+            self._payload_from_content(
+                content,
+                220 * total,
+                instructions=_BUBBLES_PROMPT_TMPL.format_map({"total": total}),
+            ),
         )
-        top_ratio = bubble_box[1] / max(1.0, effective_height)
-        if top_ratio <= 0.15 and len(text) > 15 and not has_warrior_keywords:
-            voice_archetype = "system"
-            stability = max(stability, 0.6)
-
-        base_stability, similarity_boost, style = self._emotion_to_settings(emotion)
-        if stability == 0.5:
-            stability = base_stability
-        else:
-            stability = min(stability, base_stability)
+        if not reply:
+            return None
+        try:
+            parsed = _json_loads(self._strip_code_fences(reply))
+        except ValueError:
+            return None
+        if not isinstance(parsed, list) or len(parsed) != total:
+            return None
+        return [item if isinstance(item, str) else "" for item in parsed]
 
-        voice_id = self.VOICE_MAPPING.get(voice_archetype, "voice_narrator_f")
-        
-        print(
-            f"🎭 Text Analysis: {emotion} ({tone}) → {voice_id} "
-            f"[stability: {stability}, style: {style}]"
-        )
-        
-        return CharacterAnalysis(
-            character_type=voice_archetype,
-            emotion=emotion,
-            tone=tone,
-            voice_suggestion=voice_id,
-            stability=stability,
-            similarity_boost=similarity_boost,
-            style=style,
+    def _analyze_from_text(self, text: str, geom: BubbleGeom) -> CharacterAnalysis:
+        """Analyze text content to determine character type and emotion."""
+        # Empty or one/two-character OCR output carries no voice cues
+        if len(text.strip()) < 3:
+            return _FALLBACK_ANALYSIS
+        # If the bubble sits in the top ~15% of the page and looks like UI text, treat as system
+        analysis = _text_analysis(text, geom.in_top_band)
+
+        logger.debug(
+            "🎭 Text Analysis: %s (%s) → %s [stability: %s, style: %s]",
+            analysis.emotion,
+            analysis.tone,
+            analysis.voice_suggestion,
+            analysis.stability,
+            analysis.style,
         )
+        return analysis
 
     def _is_ocr_gibberish(self, text: str) -> bool:
         """Detect if OCR produced gibberish that needs vision API correction."""
@@ -1026,7 +1877,7 @@ class VisionService:
         
         # Count how many characters are NOT letters/numbers/basic punctuation
         total_chars = len(text)
-        junk_chars = sum(1 for char in text if char not in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 ?!.,;:-'\"")
+        junk_chars = len(text.translate(_OCR_ALLOWED_DELETE))
         junk_ratio = junk_chars / max(1, total_chars)
         
         # If more than 25% junk characters, it's probably gibberish
@@ -1034,106 +1885,342 @@ class VisionService:
             return True
         
         # Check for common OCR mistakes with UI text
-        gibberish_patterns = ["\\", "|", "Ny ", "Sy.", "gl ag", "eo y"]
-        if any(pattern in text for pattern in gibberish_patterns):
-            return True
-        
-        return False
+        return _OCR_GIBBERISH_RE.search(text) is not None
 
-    def _read_with_vision(self, image_path: Path, bubble_box: list[int]) -> str:
-        """Use the vision model to read text from a specific region."""
+    def _read_with_vision(
+        self,
+        image_path: Path,
+        bubble_box: list[int],
+        image: Image.Image | None = None,
+    ) -> str:
+        """Use the vision model to read text from a specific region.
+
+        Pass the already-decoded page as ``image`` when reading many regions
+        from the same page.
+        """
         if not settings.openai_api_key:
-            print("⚠️ OpenAI API key not set, skipping vision API")
+            logger.warning("⚠️ OpenAI API key not set, skipping vision API")
             return ""
         
         try:
-            # Crop the image to the bubble region
-            from PIL import Image
-            image = Image.open(image_path)
-            crop = image.crop((bubble_box[0], bubble_box[1], bubble_box[2], bubble_box[3]))
-            
-            # Convert to base64
-            import io
-            buffered = io.BytesIO()
-            crop.save(buffered, format="PNG")
-            img_bytes = buffered.getvalue()
-            img_base64 = base64.b64encode(img_bytes).decode()
-            
-            prompt = (
-                "Read ONLY the text visible in this cropped bubble/panel. "
-                "Return just the text (single line)."
+            return self._read_region(
+                image_path,
+                bubble_box,
+                _READ_REGION_PROMPT,
+                max_tokens=150,
+                max_dim=REGION_MAX_DIM,
+                image=image,
             )
-            text = self._call_openai(prompt, img_base64, max_tokens=150)
-            if text:
-                return text.replace("\n", " ").replace("  ", " ").strip()
-            return ""
-            
         except Exception as e:
-            print(f"❌ Vision API failed: {type(e).__name__}: {str(e)}")
+            logger.error("❌ Vision API failed: %s: %s", type(e).__name__, e)
             return ""
 
-    def _call_openai(self, prompt: str, img_base64: str, max_tokens: int = 500) -> str:
+    def _read_region(
+        self,
+        image_path: Path,
+        bubble_box: list[int],
+        prompt: str,
+        *,
+        max_tokens: int,
+        max_dim: int,
+        image: Image.Image | None = None,
+    ) -> str:
+        """Crop, encode and read one region as a single line; API errors propagate."""
+        # A single bubble reads fine at low detail from a small JPEG
+        if image is None:
+            image = self.load_page(image_path)
+        img_base64 = self._encode_crop(image, bubble_box, max_dim=max_dim)
+        return _single_line(
+            self._call_openai(prompt, img_base64, max_tokens=max_tokens, detail="low")
+        )
+
+    def _call_openai(
+        self,
+        prompt: str,
+        img_base64: str,
+        max_tokens: int = 500,
+        mime_type: str = "",
+        detail: str | None = None,
+        cache_if: Callable[[str], bool] | None = None,
+    ) -> str:
+        """Send one image + prompt; non-empty replies that pass ``cache_if`` are cached."""
         if not settings.openai_api_key:
             return ""
-        
-        headers = {
-            "Authorization": f"Bearer {settings.openai_api_key}",
-            "Content-Type": "application/json",
-        }
-        payload = {
-            "model": self.VISION_MODEL,
-            "input": [
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "input_text", "text": prompt},
-                        {
-                            "type": "input_image",
-                            "image_url": f"data:image/png;base64,{img_base64}",
-                        },
-                    ],
-                }
-            ],
-            "max_output_tokens": max_tokens,
-        }
+        cache_key = self._reply_cache_key(prompt, img_base64, max_tokens, mime_type, detail)
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            logger.debug("♻️ Vision reply served from cache")
+            return cached
+        text = self._post_openai(
+            self._build_payload(prompt, img_base64, max_tokens, mime_type, detail)
+        )
+        if text.strip() and (cache_if is None or cache_if(text)):
+            _RESPONSE_CACHE.set(cache_key, text)
+        return text
+
+    def _stream_segment_entries(
+        self, prompt: str, img_base64: str, max_tokens: int
+    ) -> list[VisionTextEntry]:
+        """Streamed counterpart of _call_openai for slices, sharing its reply cache."""
+        cache_key = self._reply_cache_key(prompt, img_base64, max_tokens)
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            logger.debug("♻️ Vision reply served from cache")
+            return list(self._iter_streamed_entries((cached,)))
+
+        deltas: list[str] = []
+
+        def recorded() -> Iterator[str]:
+            for delta in self._stream_openai(
+                self._build_payload(prompt, img_base64, max_tokens)
+            ):
+                deltas.append(delta)
+                yield delta
+
+        # Entries are decoded while the rest of the response is still arriving
+        entries = list(self._iter_streamed_entries(recorded()))
+        if entries:
+            _RESPONSE_CACHE.set(cache_key, "".join(deltas))
+        return entries
+
+    def _reply_cache_key(
+        self,
+        prompt: str,
+        img_base64: str,
+        max_tokens: int,
+        mime_type: str = "",
+        detail: str | None = None,
+    ) -> str:
+        return _RESPONSE_CACHE.key(_VISION_MODEL, prompt, img_base64, max_tokens, mime_type, detail)
+
+    async def _call_openai_async(
+        self,
+        client: httpx.AsyncClient,
+        prompt: str,
+        img_base64: str,
+        max_tokens: int = 500,
+        mime_type: str = "",
+        detail: str | None = None,
+    ) -> str:
+        if not settings.openai_api_key:
+            return ""
+        return await self._post_openai_async(
+            client, self._build_payload(prompt, img_base64, max_tokens, mime_type, detail)
+        )
+
+    async def _post_openai_async(
+        self, client: httpx.AsyncClient, payload: dict[str, Any]
+    ) -> str:
+        last_error: Exception | None = None
+        estimated_tokens = _estimate_request_tokens(payload)
+        body = _json_dumps(payload)
+        max_attempts = max(1, settings.openai_max_attempts)
+        for attempt in range(max_attempts):
+            delay = _RATE_LIMITER.reserve(estimated_tokens)
+            if delay:
+                await asyncio.sleep(delay)
+            response = await client.post(self.OPENAI_URL, headers=_OPENAI_HEADERS, content=body)
+            if response.status_code == 429 or response.status_code >= 500:
+                wait_time = self._retry_delay(response.headers, attempt)
+                if response.status_code == 429:
+                    _RATE_LIMITER.pause(wait_time)
+                logger.warning(
+                    "⚠️ Vision API returned %d (attempt %d/%d). Retrying in %.2fs...",
+                    response.status_code,
+                    attempt + 1,
+                    max_attempts,
+                    wait_time,
+                )
+                last_error = httpx.HTTPStatusError(
+                    _error_excerpt(response.content),
+                    request=response.request,
+                    response=response,
+                )
+                await asyncio.sleep(wait_time)
+                continue
+            if response.is_error:
+                logger.error(
+                    "❌ Vision HTTPError %d: %s",
+                    response.status_code,
+                    _error_excerpt(response.content),
+                )
+                response.raise_for_status()
+            return self._extract_openai_output(_json_loads(response.content))
+
+        assert last_error is not None
+        raise last_error
 
+    def _retry_delay(self, headers: Mapping[str, str], attempt: int) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+        backoff = random.uniform(0, min(RETRY_MAX_DELAY, 0.5 * 2**attempt))
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return backoff
+        try:
+            requested = float(retry_after)
+        except ValueError:
+            try:
+                requested = (
+                    parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)
+                ).total_seconds()
+            except (TypeError, ValueError):
+                return backoff
+        return min(RETRY_MAX_DELAY, max(requested, backoff))
+
+    def _post_openai(self, payload: dict[str, Any]) -> str:
+        response = self._send_openai(payload)
+        # Decode the raw body in one pass instead of response.json()'s
+        # charset sniffing + str decode + stdlib parse
+        data = _json_loads(response.content)
+        return self._extract_openai_output(data)
+
+    def _stream_openai(self, payload: dict[str, Any]) -> Iterator[str]:
+        """Yield output text deltas from a streamed (SSE) Responses call."""
+        if not settings.openai_api_key:
+            return
+        with self._send_openai({**payload, "stream": True}, stream=True) as response:
+            for line in response.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                event = _json_loads(data)
+                event_type = event.get("type")
+                if event_type == "response.output_text.delta":
+                    yield event.get("delta") or ""
+                elif event_type in {"response.failed", "error"}:
+                    raise requests.HTTPError(f"Vision stream failed: {event}", response=response)
+
+    def _send_openai(self, payload: dict[str, Any], *, stream: bool = False) -> requests.Response:
         last_error: Exception | None = None
-        for attempt in range(4):
-            response = requests.post(
-                self.OPENAI_URL, headers=headers, json=payload, timeout=60
+        # Serialized once; retries resend the same bytes
+        estimated_tokens = _estimate_request_tokens(payload)
+        body = _json_dumps(payload)
+        max_attempts = max(1, settings.openai_max_attempts)
+        for attempt in range(max_attempts):
+            delay = _RATE_LIMITER.reserve(estimated_tokens)
+            if delay:
+                time.sleep(delay)
+            response = _SESSION.post(
+                self.OPENAI_URL,
+                headers=_OPENAI_HEADERS,
+                data=body,
+                timeout=60,
+                stream=stream,
             )
-            if response.status_code == 429:
-                wait_time = min(6.0, 1.5 * (attempt + 1))
-                print(
-                    f"⚠️ Vision API rate limited (attempt {attempt + 1}/4). "
-                    f"Retrying in {wait_time:.2f}s..."
+            if response.status_code == 429 or response.status_code >= 500:
+                wait_time = self._retry_delay(response.headers, attempt)
+                if response.status_code == 429:
+                    _RATE_LIMITER.pause(wait_time)
+                logger.warning(
+                    "⚠️ Vision API returned %d (attempt %d/%d). Retrying in %.2fs...",
+                    response.status_code,
+                    attempt + 1,
+                    max_attempts,
+                    wait_time,
+                )
+                last_error = requests.HTTPError(
+                    _error_excerpt(response.content), response=response
                 )
+                response.close()
                 time.sleep(wait_time)
-                last_error = requests.HTTPError(response.text, response=response)
                 continue
 
             try:
                 response.raise_for_status()
             except requests.HTTPError as exc:
-                body = response.text if response is not None else ""
-                print(
-                    f"❌ Vision HTTPError "
-                    f"{response.status_code if response else '??'}: {body[:500]}"
+                logger.error(
+                    "❌ Vision HTTPError %d: %s",
+                    response.status_code,
+                    _error_excerpt(response.content),
                 )
                 last_error = exc
                 break
+            return response
+
+        assert last_error is not None
+        raise last_error
+
+    def _iter_streamed_entries(self, deltas: Iterable[str]) -> Iterator[VisionTextEntry]:
+        """Yield entries from a streamed JSON array as soon as each element closes.
+
+        Falls back to _parse_detected_entries on the full text when the reply
+        turns out not to be a JSON array (plain text, prose around brackets).
+        """
+        buffer = ""
+        pos = -1
+        yielded = False
+        for delta in deltas:
+            buffer += delta
+            if pos < 0:
+                start = buffer.find("[")
+                if start < 0:
+                    continue
+                pos = start + 1
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos >= len(buffer) or buffer[pos] == "]":
+                    break
+                try:
+                    value, pos = _JSON_DECODER.raw_decode(buffer, pos)
+                except ValueError:
+                    break  # element still incomplete; wait for more text
+                for entry in self._extract_entries_from_structure(value):
+                    yielded = True
+                    yield entry
+        if not yielded:
+            yield from self._parse_detected_entries(buffer)
+
+    def _build_payload(
+        self,
+        prompt: str,
+        img_base64: str,
+        max_tokens: int,
+        mime_type: str = "",
+        detail: str | None = None,
+    ) -> dict[str, Any]:
+        mime_type = mime_type or _IMAGE_MIME
+        image_part = {
+            "type": "input_image",
+            "image_url": f"data:{mime_type};base64,{img_base64}",
+        }
+        if detail:
+            image_part["detail"] = detail
+        return self._payload_from_content([image_part], max_tokens, instructions=prompt)
 
-            data = response.json()
-            return self._extract_openai_output(data)
-
-        if last_error:
-            raise last_error
-        return ""
+    def _payload_from_content(
+        self,
+        content: list[dict[str, str]],
+        max_tokens: int,
+        instructions: str | None = None,
+    ) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            **_BASE_PAYLOAD,
+            "input": [{"role": "user", "content": content}],
+            "max_output_tokens": max_tokens,
+        }
+        if instructions:
+            # Static prompt goes ahead of the images so every call with it shares
+            # a cacheable prefix; the key routes those calls to the same cache
+            payload["instructions"] = instructions
+            payload["prompt_cache_key"] = _prompt_cache_key(instructions)
+        return payload
 
     def _extract_openai_output(self, payload: dict) -> str:
         if not payload:
             return ""
-        
+
+        # Fast path: the usual reply is one message holding one output_text part
+        try:
+            (message,) = payload["output"]
+            (item,) = message["content"]
+            if item["type"] == "output_text":
+                return item["text"].strip()
+        except (AttributeError, KeyError, TypeError, ValueError):
+            pass
+
         outputs = payload.get("output") or []
         text_chunks: list[str] = []
         for message in outputs:
@@ -1152,15 +2239,7 @@ class VisionService:
 
     def _fallback_analysis(self) -> CharacterAnalysis:
         """Fallback when AI analysis isn't available."""
-        return CharacterAnalysis(
-            character_type="unknown",
-            emotion="neutral",
-            tone="normal",
-            voice_suggestion="voice_narrator_f",
-            stability=0.5,
-            similarity_boost=0.75,
-            style=0.2,
-        )
+        return _FALLBACK_ANALYSIS
 
 
 vision_service = VisionService()
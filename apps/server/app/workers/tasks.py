@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-import tempfile
+import logging
+import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from difflib import SequenceMatcher
 from pathlib import Path
-import re
 from typing import Any, Iterable, TypedDict
 
 import requests
 from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.core.config import settings
 from app.models.schemas import (
@@ -18,8 +22,27 @@ from app.models.schemas import (
     WordTime,
 )
 from app.services.pipeline import chapter_store
-from app.services.tts import tts_service
-from app.services.vision import CharacterAnalysis, vision_service
+from app.services.tts import TTSResult, tts_service
+from app.services.vision import CharacterAnalysis, letter_case_counts, vision_service
+
+logger = logging.getLogger(__name__)
+
+# Page downloads for one chapter hit the same storage host back to back; keep the
+# connection alive and retry transient failures (GETs are safe to repeat)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        ),
+    ),
+)
 
 
 class ChapterFile(TypedDict):
@@ -64,13 +87,46 @@ def enqueue_chapter_job(
     return job.job_id
 
 
+def enqueue_speaker_job(speaker_id: str, voice_id: str) -> str:
+    job = chapter_store.create_job()
+    chapter_store.queue.enqueue_call(
+        func=resynthesize_speaker,
+        args=(speaker_id, voice_id, job.job_id),
+        result_ttl=0,
+        failure_ttl=86400,
+        timeout=settings.job_timeout_seconds,
+    )
+    return job.job_id
+
+
+def resynthesize_speaker(speaker_id: str, voice_id: str, job_id: str | None = None) -> None:
+    """Move every bubble of a speaker to a new voice once its audio is regenerated."""
+    if job_id:
+        chapter_store.update_job(job_id, status="processing", progress=10)
+    try:
+        chapter_store.resynthesize_speaker(speaker_id, voice_id)
+    except Exception as exc:
+        if job_id:
+            chapter_store.update_job(job_id, status="failed", error=str(exc))
+        raise
+    if job_id:
+        chapter_store.update_job(job_id, status="ready", progress=100)
+
+
+# Pipes and newlines become spaces; semicolons are OCR noise and are dropped
+_OCR_ARTIFACTS = str.maketrans({"|": " ", "\n": " ", ";": None})
+_EDGE_QUOTES_RE = re.compile(r"^['\"]+|['\"]+$")
+_WHITESPACE_RE = re.compile(r"\s+")
+_CLAUSE_SPLIT_RE = re.compile(r"([,.;!?])")
+_WHITESPACE_SPLIT_RE = re.compile(r"(\s+)")
+_SFX_PREFIX_RE = re.compile(r"^(?:sfx|fx)\s*[:\-]\s*", re.IGNORECASE)
+
+
 def _normalize_text(text: str) -> str:
     # Remove OCR artifacts and normalize spacing
-    cleaned = text.replace("|", " ")
-    cleaned = cleaned.replace("\n", " ")
-    cleaned = cleaned.replace(";", "")  # Remove semicolons (OCR artifacts)
-    cleaned = re.sub(r"^['\"]+|['\"]+$", "", cleaned)  # Remove leading/trailing quotes
-    cleaned = re.sub(r"\s+", " ", cleaned)  # Normalize whitespace
+    cleaned = text.translate(_OCR_ARTIFACTS)
+    cleaned = _EDGE_QUOTES_RE.sub("", cleaned)  # Remove leading/trailing quotes
+    cleaned = _WHITESPACE_RE.sub(" ", cleaned)  # Normalize whitespace
     return cleaned.strip()
 
 
@@ -83,7 +139,7 @@ def _clean_redundant_phrases(text: str) -> str:
     if len(lowered) < 5:
         return text
 
-    segments = re.split(r"([,.;!?])", text)
+    segments = _CLAUSE_SPLIT_RE.split(text)
     cleaned_segments: list[str] = []
 
     for i in range(0, len(segments), 2):
@@ -118,16 +174,22 @@ def _clean_redundant_phrases(text: str) -> str:
 
 
 def _humanize_caps_for_tts(text: str) -> str:
-    tokens = re.split(r"(\s+)", text)
+    tokens = _WHITESPACE_SPLIT_RE.split(text)
     transformed: list[str] = []
 
     def should_soften(token: str) -> bool:
-        letters = [c for c in token if c.isalpha()]
-        if not letters:
-            return False
-        if any(c.islower() for c in token):
-            return False
-        if "." in token:
+        if token.isascii():
+            # ASCII letters are exactly the cased characters, so isupper() is
+            # "no lowercase and at least one letter" in a single C call
+            return token.isupper() and "." not in token
+        # One pass: any lowercase rules it out, otherwise it needs a letter
+        has_letter = False
+        for c in token:
+            if c.islower():
+                return False
+            if c.isalpha():
+                has_letter = True
+        if not has_letter or "." in token:
             return False
         # treat long all-caps or repeated letters as SFX words
         return True
@@ -138,41 +200,86 @@ def _humanize_caps_for_tts(text: str) -> str:
         else:
             transformed.append(token)
     return "".join(transformed)
+
+
 def _strip_sfx_prefix(text: str) -> str:
-    return re.sub(r"^(?:sfx|fx)\s*[:\-]\s*", "", text, flags=re.IGNORECASE).strip()
-
-
-SFX_KEYWORDS = {
-    "boom",
-    "bang",
-    "kraa",
-    "krak",
-    "wham",
-    "slam",
-    "snap",
-    "crash",
-    "thud",
-    "whoosh",
-    "fwoosh",
-    "fwip",
-    "swoosh",
-    "kshh",
-    "pow",
-    "zap",
-}
+    return _SFX_PREFIX_RE.sub("", text).strip()
+
+
+SFX_KEYWORDS = frozenset(
+    {
+        "boom",
+        "bang",
+        "kraa",
+        "krak",
+        "wham",
+        "slam",
+        "snap",
+        "crash",
+        "thud",
+        "whoosh",
+        "fwoosh",
+        "fwip",
+        "swoosh",
+        "kshh",
+        "pow",
+        "zap",
+    }
+)
 
 
-APOLOGY_PATTERNS = {
-    "i'm sorry, i can't transcribe",
-    "i'm sorry, i can't assist",
-    "i'm sorry, but i cannot",
-    "i can't see the speech bubble",
-    "i'm sorry, but i can't",
-    "i cannot assist with that",
-}
+APOLOGY_PATTERNS = frozenset(
+    {
+        "i'm sorry, i can't transcribe",
+        "i'm sorry, i can't assist",
+        "i'm sorry, but i cannot",
+        "i can't see the speech bubble",
+        "i'm sorry, but i can't",
+        "i cannot assist with that",
+    }
+)
+
+
+def _substring_alternation(patterns: Iterable[str]) -> re.Pattern[str]:
+    """One compiled scan matching any of ``patterns`` anywhere in the text."""
+    return re.compile("|".join(re.escape(p) for p in sorted(patterns, key=len, reverse=True)))
+
+
+# Substring semantics as before ("kaboom" still matches "boom"), one pass per text
+_SFX_KEYWORD_RE = _substring_alternation(SFX_KEYWORDS)
+_APOLOGY_RE = _substring_alternation(APOLOGY_PATTERNS)
+_SFX_SHOUT_RE = re.compile(r"[A-Z!?]{2,}")
+# Character-type descriptors checked for every bubble, twice per page build
+_NARRATION_KIND_RE = _substring_alternation(
+    ("system", "ui", "computer", "panel", "narration", "narrator")
+)
+_SFX_KIND_RE = _substring_alternation(("sfx", "sound", "fx"))
 
 MIN_GAP_HEIGHT = 380
 MAX_GAP_REGIONS = 5
+# Each gap read encodes slices and fans them out to the slice pool; the worker VM
+# has one CPU and 1 GB, so only a couple run at once
+MAX_PARALLEL_GAP_READS = 2
+
+# Clips of one page are independent provider calls; bounded to the TTS session pool
+MAX_PARALLEL_TTS = 6
+# Pages whose vision pass may run ahead while an earlier page is being voiced
+VISION_READ_AHEAD = 1
+
+TONE_HINTS = {
+    "questioning": "Sound curious and slightly rising toward the end.",
+    "dramatic": "Lean into a dramatic delivery with controlled pacing.",
+    "serious": "Keep the delivery measured and grounded.",
+    "playful": "Add a light, playful lilt.",
+    "neutral": "",
+}
+
+EMOTION_HINTS = {
+    "angry": "Add intensity as if angry.",
+    "excited": "Sound excited and energetic.",
+    "sad": "Soften the tone, as if saddened.",
+    "scared": "Let a hint of fear or urgency come through.",
+}
 
 
 def _looks_like_sfx_text(text: str) -> bool:
@@ -181,16 +288,15 @@ def _looks_like_sfx_text(text: str) -> bool:
         return False
     # short, mostly uppercase, or contains classic SFX keywords
     words = trimmed.split()
-    letters = [c for c in trimmed if c.isalpha()]
-    upper_letters = [c for c in letters if c.isupper()]
-    upper_ratio = (len(upper_letters) / len(letters)) if letters else 0
+    letter_count, upper_count = letter_case_counts(trimmed)
+    upper_ratio = (upper_count / letter_count) if letter_count else 0
 
     if len(words) <= 3 and upper_ratio >= 0.8:
         return True
     lowered = trimmed.lower()
-    if any(keyword in lowered for keyword in SFX_KEYWORDS):
+    if _SFX_KEYWORD_RE.search(lowered):
         return True
-    if re.fullmatch(r"[A-Z!?]{2,}", trimmed.upper()):
+    if _SFX_SHOUT_RE.fullmatch(trimmed.upper()):
         return True
     return False
 
@@ -205,57 +311,70 @@ def _recover_missing_bubbles(
         return bubbles
 
     try:
-        with Image.open(image_path) as image:
-            image_width = int(page_width or image.width)
-            total_height = int(page_height or image.height)
-
-            sorted_bubbles = sorted(bubbles, key=lambda entry: entry[0][1])
-            gaps: list[tuple[int, int]] = []
-            prev_bottom = 0
-
-            for bubble_box, _, _ in sorted_bubbles:
-                top = max(0, int(bubble_box[1]))
-                if top - prev_bottom >= MIN_GAP_HEIGHT:
-                    gaps.append((prev_bottom, min(top, total_height)))
-                prev_bottom = max(prev_bottom, int(bubble_box[3]))
-
-            if total_height - prev_bottom >= MIN_GAP_HEIGHT:
-                gaps.append((prev_bottom, total_height))
-
-            if not gaps:
-                return bubbles
-
-            recovered: list[tuple[list[float], str, CharacterAnalysis]] = []
-            for gap_start, gap_end in gaps[:MAX_GAP_REGIONS]:
-                if gap_end - gap_start < MIN_GAP_HEIGHT:
-                    continue
-
-                crop = image.crop((0, gap_start, image_width, gap_end))
-                if crop.height < 80:
-                    continue
-
-                with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-                    temp_path = Path(tmp.name)
-                    crop.save(temp_path)
-                try:
-                    extra = vision_service.detect_and_read_all_bubbles(temp_path)
-                finally:
-                    temp_path.unlink(missing_ok=True)
-
-                for box, text, analysis in extra:
-                    adjusted_box = [
-                        box[0],
-                        box[1] + gap_start,
-                        box[2],
-                        box[3] + gap_start,
-                    ]
-                    recovered.append((adjusted_box, text, analysis))
-
-            if recovered:
-                print(f"✨ Gap recovery added {len(recovered)} bubble(s)")
-                return bubbles + recovered
+        if not page_width or not page_height:
+            page_width, page_height = vision_service.page_size(image_path)
+        image_width = int(page_width)
+        total_height = int(page_height)
+
+        sorted_bubbles = sorted(bubbles, key=lambda entry: entry[0][1])
+        gaps: list[tuple[int, int]] = []
+        prev_bottom = 0
+
+        for bubble_box, _, _ in sorted_bubbles:
+            top = max(0, int(bubble_box[1]))
+            if top - prev_bottom >= MIN_GAP_HEIGHT:
+                gaps.append((prev_bottom, min(top, total_height)))
+            prev_bottom = max(prev_bottom, int(bubble_box[3]))
+
+        if total_height - prev_bottom >= MIN_GAP_HEIGHT:
+            gaps.append((prev_bottom, total_height))
+
+        if not gaps:
+            return bubbles
+
+        # Crops come from the decoded page in memory and are read in memory too
+        image = vision_service.load_page(image_path)
+        gap_crops: list[tuple[int, Image.Image]] = []
+        for gap_start, gap_end in gaps[:MAX_GAP_REGIONS]:
+            if gap_end - gap_start < MIN_GAP_HEIGHT:
+                continue
+
+            crop = image.crop((0, gap_start, image_width, gap_end))
+            if crop.height < 80:
+                continue
+            gap_crops.append((gap_start, crop))
+
+        if not gap_crops:
+            return bubbles
+
+        # Each gap is an independent vision round trip; local detection inside
+        # them is serialized by vision_service, the network calls overlap
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_PARALLEL_GAP_READS, len(gap_crops))
+        ) as pool:
+            gap_results = list(
+                pool.map(
+                    vision_service.detect_and_read_all_bubbles_image,
+                    [crop for _, crop in gap_crops],
+                )
+            )
+
+        recovered: list[tuple[list[float], str, CharacterAnalysis]] = []
+        for (gap_start, _), extra in zip(gap_crops, gap_results):
+            for box, text, analysis in extra:
+                adjusted_box = [
+                    box[0],
+                    box[1] + gap_start,
+                    box[2],
+                    box[3] + gap_start,
+                ]
+                recovered.append((adjusted_box, text, analysis))
+
+        if recovered:
+            logger.info("✨ Gap recovery added %d bubble(s)", len(recovered))
+            return bubbles + recovered
     except (FileNotFoundError, OSError) as exc:
-        print(f"⚠️ Gap recovery skipped: {exc}")
+        logger.warning("⚠️ Gap recovery skipped: %s", exc)
 
     return bubbles
 
@@ -276,26 +395,11 @@ def _build_tone_hint(text: str, analysis: CharacterAnalysis) -> str | None:
     if "…" in trimmed:
         hints.append("Let the ellipsis trail off softly.")
 
-    tone = (analysis.tone or "").lower()
-    tone_map = {
-        "questioning": "Sound curious and slightly rising toward the end.",
-        "dramatic": "Lean into a dramatic delivery with controlled pacing.",
-        "serious": "Keep the delivery measured and grounded.",
-        "playful": "Add a light, playful lilt.",
-        "neutral": "",
-    }
-    tone_hint = tone_map.get(tone)
+    tone_hint = TONE_HINTS.get((analysis.tone or "").lower())
     if tone_hint:
         hints.append(tone_hint)
 
-    emotion = (analysis.emotion or "").lower()
-    emotion_map = {
-        "angry": "Add intensity as if angry.",
-        "excited": "Sound excited and energetic.",
-        "sad": "Soften the tone, as if saddened.",
-        "scared": "Let a hint of fear or urgency come through.",
-    }
-    emotion_hint = emotion_map.get(emotion)
+    emotion_hint = EMOTION_HINTS.get((analysis.emotion or "").lower())
     if emotion_hint:
         hints.append(emotion_hint)
 
@@ -333,13 +437,11 @@ def _build_tts_delivery_text(text: str, analysis: CharacterAnalysis) -> str:
 
 def _bubble_kind_from_analysis(analysis: CharacterAnalysis) -> str:
     descriptor = (analysis.character_type or "").lower()
-    if any(keyword in descriptor for keyword in ("system", "ui", "computer", "panel")):
-        return "narration"
-    if any(keyword in descriptor for keyword in ("narration", "narrator")):
+    if _NARRATION_KIND_RE.search(descriptor):
         return "narration"
     if "thought" in descriptor:
         return "thought"
-    if "sfx" in descriptor or "sound" in descriptor or "fx" in descriptor:
+    if _SFX_KIND_RE.search(descriptor):
         return "sfx"
     return "dialogue"
 
@@ -357,202 +459,48 @@ def process_chapter(
     pages: list[PagePayload] = []
     total_files = len(files)
     character_voice_memory: dict[str, tuple[str, float, float, float]] = {}
-    for index, file_info in enumerate(files):
-        page_width = file_info.get("width") or 1080
-        page_height = file_info.get("height") or 1920
-        image_path = _ensure_local_image(file_info, chapter_id, index)
-
-        # 🤖 USE DEEPSEEK VISION API TO DETECT AND READ ALL TEXT
-        # OCR completely removed - Vision AI does everything!
-        print(f"🤖 Using GPT-4o-mini Vision API to read page {index} (mode: {processing_mode})")
-        print(f"📁 Image path: {image_path}, exists: {image_path.exists()}")
-        
-        try:
-            vision_bubbles = vision_service.detect_and_read_all_bubbles(image_path)
-        except Exception as e:
-            print(f"❌ Vision API call failed: {type(e).__name__}: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-            vision_bubbles = []
-        
-        if not vision_bubbles:
-            print(
-                f"⚠️ Vision API returned no bubbles for page {index}; "
-                "keeping artwork but skipping audio."
-            )
-        else:
-            print(
-                f"✨ Vision API found {len(vision_bubbles)} text elements (mode: {processing_mode})"
-            )
-
-        # STEP 1: Collect all candidate bubbles (filter out obvious junk)
-        candidates: list[tuple[list[float], str, Any, str]] = []
-        # Attempt to recover bubbles in large gaps that the main pass missed
-        vision_bubbles = _recover_missing_bubbles(
-            image_path,
-            page_width,
-            page_height,
-            vision_bubbles,
-        )
-
-        for bubble_box, text, analysis in vision_bubbles:
-            normalized_text = _normalize_text(text)
-            bubble_type = _bubble_kind_from_analysis(analysis)
-            if processing_mode == "narrate" and bubble_type != "sfx":
-                if _looks_like_sfx_text(normalized_text):
-                    bubble_type = "sfx"
-            
-            # FILTER OUT HALLUCINATIONS
-            if normalized_text.lower() in {"jason", "json"}:
-                continue
-            if len(normalized_text) < 2 and not normalized_text.isalnum():
-                continue
-            
-            # FILTER OUT GPT APOLOGY PHRASES
-            text_lower = normalized_text.lower()
-            if any(pattern in text_lower for pattern in APOLOGY_PATTERNS):
-                continue
-            
-            candidates.append((bubble_box, normalized_text, analysis, text_lower))
-        
-        # STEP 2: Deduplicate by keeping the LONGEST/MOST COMPLETE version of each sentence
-        def normalize_for_comparison(text: str) -> str:
-            """Remove spaces, hyphens, and extra whitespace for accurate duplicate detection."""
-            return text.replace(" ", "").replace("-", "").replace("\n", "").replace("\r", "")
-        
-        unique_bubbles: list[tuple[list[float], str, Any]] = []
-        used_indices: set[int] = set()
-        
-        for i, (box_i, text_i, analysis_i, lower_i) in enumerate(candidates):
-            if i in used_indices:
-                continue
-            
-            # Normalize for comparison (remove spaces/hyphens)
-            normalized_i = normalize_for_comparison(lower_i)
-            
-            # Find all similar texts (duplicates/substrings) - check ALL candidates
-            similar_group = [(i, box_i, text_i, analysis_i, lower_i, normalized_i)]
-            for j, (box_j, text_j, analysis_j, lower_j) in enumerate(candidates):
-                if j == i or j in used_indices:  # Skip self and already-used
-                    continue
-                
-                normalized_j = normalize_for_comparison(lower_j)
-                
-                longer = max(len(normalized_i), len(normalized_j))
-                shorter = min(len(normalized_i), len(normalized_j))
-                substring_match = (
-                    normalized_i in normalized_j or normalized_j in normalized_i
-                )
-                length_ratio = shorter / longer if longer else 1.0
-                similarity = SequenceMatcher(None, normalized_i, normalized_j).ratio()
-
-                if substring_match and length_ratio > 0.7:
-                    similar_group.append((j, box_j, text_j, analysis_j, lower_j, normalized_j))
-                elif similarity >= 0.88:
-                    similar_group.append((j, box_j, text_j, analysis_j, lower_j, normalized_j))
-            
-            # Pick the LONGEST one from the group (most complete sentence)
-            # Use the normalized length for comparison
-            best = max(similar_group, key=lambda x: len(x[5]))
-            unique_bubbles.append((best[1], best[2], best[3]))
-            
-            # Mark all in this group as used
-            for idx, *_ in similar_group:
-                used_indices.add(idx)
-        
-        print(f"✨ After deduplication: {len(unique_bubbles)} unique bubbles")
-
-        # STEP 3: Generate TTS for unique bubbles
-        items: list[BubbleItem] = []
-        for bubble_idx, (bubble_box, normalized_text, analysis) in enumerate(unique_bubbles):
-            cleaned_text = _clean_redundant_phrases(normalized_text)
-            tts_ready_text = _humanize_caps_for_tts(cleaned_text)
-            bubble_type = _bubble_kind_from_analysis(analysis)
-                
-            character_key = (analysis.character_type or "").strip().lower()
-            reuse_allowed = (
-                processing_mode != "narrate"
-                and character_key
-                and character_key not in {"unknown", "sfx_autodetect"}
-                and bubble_type not in {"sfx", "narration"}
+    page_reader = ThreadPoolExecutor(max_workers=1 + VISION_READ_AHEAD)
+    tts_pool = ThreadPoolExecutor(max_workers=MAX_PARALLEL_TTS)
+    try:
+        # Vision for the next pages overlaps TTS for the current one; results are
+        # consumed in page order so voice memory and progress stay sequential.
+        # At most 1 + VISION_READ_AHEAD reads are queued, and a new one is only
+        # submitted once a page is taken off the front
+        page_reads: deque[Future] = deque()
+        for index in range(min(1 + VISION_READ_AHEAD, total_files)):
+            page_reads.append(
+                page_reader.submit(_read_page, files[index], chapter_id, index, processing_mode)
             )
-            if processing_mode == "narrate":
-                assigned_voice = (
-                    "voice_narrator_m" if narrator_gender == "male" else "voice_narrator_f"
-                )
-                stability = 0.7
-                similarity_boost = 0.85
-                speaker_label = "Narrator"
-                style = 0.25
-            else:
-                if reuse_allowed and character_key in character_voice_memory:
-                    cached_voice, cached_stability, cached_similarity, cached_style = (
-                        character_voice_memory[character_key]
+        for index, file_info in enumerate(files):
+            page_width, page_height, vision_bubbles = page_reads.popleft().result()
+            next_index = index + 1 + VISION_READ_AHEAD
+            if next_index < total_files:
+                page_reads.append(
+                    page_reader.submit(
+                        _read_page, files[next_index], chapter_id, next_index, processing_mode
                     )
-                    assigned_voice = cached_voice
-                    stability = cached_stability
-                    similarity_boost = cached_similarity
-                    style = cached_style
-                else:
-                    assigned_voice = analysis.voice_suggestion
-                    stability = analysis.stability
-                    similarity_boost = analysis.similarity_boost
-                    style = analysis.style
-                    if reuse_allowed and assigned_voice:
-                        character_voice_memory[character_key] = (
-                            assigned_voice,
-                            stability,
-                            similarity_boost,
-                            style,
-                        )
-                speaker_label = (
-                    analysis.character_type.replace("_", " ").title()
-                    if analysis.character_type
-                    else None
                 )
-            
-            # Generate TTS with emotion parameters
-            tone_hint = _build_tone_hint(cleaned_text, analysis)
-            delivery_text = _build_tts_delivery_text(tts_ready_text, analysis)
-            tts_result = tts_service.synthesize(
-                delivery_text,
-                assigned_voice,
-                stability=stability,
-                similarity_boost=similarity_boost,
-                style=style,
-                tone_hint=tone_hint,
-            )
-            
-            items.append(
-                BubbleItem(
-                    bubble_id=f"bubble_{index}_{bubble_idx}",
-                    panel_box=[0, 0, page_width, page_height],
-                    bubble_box=bubble_box,
-                    type=bubble_type,
-                    speaker_id=f"{chapter_id[:6]}_speaker_{index}_{bubble_idx}",
-                    speaker_name=speaker_label,
-                    voice_id=assigned_voice,
-                    text=cleaned_text,
-                    audio_url=tts_result.audio_url,
-                    word_times=[WordTime(**word.model_dump()) for word in tts_result.word_times],
+            pages.append(
+                _build_page(
+                    chapter_id,
+                    index,
+                    file_info,
+                    page_width,
+                    page_height,
+                    vision_bubbles,
+                    processing_mode,
+                    narrator_gender,
+                    character_voice_memory,
+                    tts_pool,
                 )
             )
 
-        items.sort(key=lambda item: item.bubble_box[1])
-        reading_order = [item.bubble_id for item in items]
-        page = PagePayload(
-            page_index=index,
-            image_url=file_info.get("image_url") or "",
-            width=page_width,
-            height=page_height,
-            items=items,
-            reading_order=reading_order,
-        )
-        pages.append(page)
-
-        if job_id:
-            progress = 10 + int(((index + 1) / total_files) * 80)
-            chapter_store.update_job(job_id, progress=progress)
+            if job_id:
+                progress = 10 + int(((index + 1) / total_files) * 80)
+                chapter_store.update_job(job_id, progress=progress)
+    finally:
+        page_reader.shutdown(cancel_futures=True)
+        tts_pool.shutdown(cancel_futures=True)
 
     chapter = ChapterPayload(
         chapter_id=chapter_id,
@@ -567,6 +515,253 @@ def process_chapter(
         chapter_store.update_job(job_id, status="ready", progress=100)
 
 
+def _read_page(
+    file_info: ChapterFile,
+    chapter_id: str,
+    index: int,
+    processing_mode: ProcessingMode,
+) -> tuple[int, int, list[tuple[list[float], str, CharacterAnalysis]]]:
+    """Page size plus every bubble the vision pass (and gap recovery) found on it."""
+    image_path = _ensure_local_image(file_info, chapter_id, index)
+    page_width = file_info.get("width")
+    page_height = file_info.get("height")
+    if not page_width or not page_height:
+        # Uploads without dimensions: the header has them, no pixel decode needed
+        try:
+            header_width, header_height = vision_service.page_size(image_path)
+        except OSError:
+            header_width, header_height = 1080, 1920
+        page_width = page_width or header_width
+        page_height = page_height or header_height
+
+    # 🤖 USE DEEPSEEK VISION API TO DETECT AND READ ALL TEXT
+    # OCR completely removed - Vision AI does everything!
+    logger.info("🤖 Using GPT-4o-mini Vision API to read page %d (mode: %s)", index, processing_mode)
+    logger.debug("📁 Image path: %s, exists: %s", image_path, image_path.exists())
+
+    try:
+        vision_bubbles = vision_service.detect_and_read_all_bubbles(image_path)
+    except Exception as e:
+        logger.exception("❌ Vision API call failed: %s: %s", type(e).__name__, e)
+        vision_bubbles = []
+
+    if not vision_bubbles:
+        logger.warning(
+            "⚠️ Vision API returned no bubbles for page %d; keeping artwork but skipping audio.",
+            index,
+        )
+    else:
+        logger.info(
+            "✨ Vision API found %d text elements (mode: %s)", len(vision_bubbles), processing_mode
+        )
+
+    # Attempt to recover bubbles in large gaps that the main pass missed
+    vision_bubbles = _recover_missing_bubbles(
+        image_path,
+        page_width,
+        page_height,
+        vision_bubbles,
+    )
+    return page_width, page_height, vision_bubbles
+
+
+def _similar_enough(a: str, b: str) -> bool:
+    # real_quick_ratio/quick_ratio are cheap upper bounds on ratio(), so most
+    # unrelated pairs never reach the full matching-blocks pass
+    matcher = SequenceMatcher(None, a, b)
+    return (
+        matcher.real_quick_ratio() >= 0.88
+        and matcher.quick_ratio() >= 0.88
+        and matcher.ratio() >= 0.88
+    )
+
+
+def _build_page(
+    chapter_id: str,
+    index: int,
+    file_info: ChapterFile,
+    page_width: int,
+    page_height: int,
+    vision_bubbles: list[tuple[list[float], str, CharacterAnalysis]],
+    processing_mode: ProcessingMode,
+    narrator_gender: str,
+    character_voice_memory: dict[str, tuple[str, float, float, float]],
+    tts_pool: ThreadPoolExecutor,
+) -> PagePayload:
+    # STEP 1: Collect all candidate bubbles (filter out obvious junk)
+    candidates: list[tuple[list[float], str, Any, str]] = []
+    for bubble_box, text, analysis in vision_bubbles:
+        normalized_text = _normalize_text(text)
+        bubble_type = _bubble_kind_from_analysis(analysis)
+        if processing_mode == "narrate" and bubble_type != "sfx":
+            if _looks_like_sfx_text(normalized_text):
+                bubble_type = "sfx"
+
+        # FILTER OUT HALLUCINATIONS
+        if normalized_text.lower() in {"jason", "json"}:
+            continue
+        if len(normalized_text) < 2 and not normalized_text.isalnum():
+            continue
+
+        # FILTER OUT GPT APOLOGY PHRASES
+        text_lower = normalized_text.lower()
+        if _APOLOGY_RE.search(text_lower):
+            continue
+
+        candidates.append((bubble_box, normalized_text, analysis, text_lower))
+
+    # STEP 2: Deduplicate by keeping the LONGEST/MOST COMPLETE version of each sentence
+    def normalize_for_comparison(text: str) -> str:
+        """Remove spaces, hyphens, and extra whitespace for accurate duplicate detection."""
+        return text.replace(" ", "").replace("-", "").replace("\n", "").replace("\r", "")
+
+    unique_bubbles: list[tuple[list[float], str, Any]] = []
+    used_indices: set[int] = set()
+    # Normalized once per candidate rather than once per pair
+    comparable = [normalize_for_comparison(candidate[3]) for candidate in candidates]
+
+    for i, (box_i, text_i, analysis_i, lower_i) in enumerate(candidates):
+        if i in used_indices:
+            continue
+
+        normalized_i = comparable[i]
+
+        # Find all similar texts (duplicates/substrings) - check ALL candidates
+        similar_group = [(i, box_i, text_i, analysis_i, lower_i, normalized_i)]
+        for j, (box_j, text_j, analysis_j, lower_j) in enumerate(candidates):
+            if j == i or j in used_indices:  # Skip self and already-used
+                continue
+
+            normalized_j = comparable[j]
+
+            longer = max(len(normalized_i), len(normalized_j))
+            shorter = min(len(normalized_i), len(normalized_j))
+            substring_match = (
+                normalized_i in normalized_j or normalized_j in normalized_i
+            )
+            length_ratio = shorter / longer if longer else 1.0
+
+            if substring_match and length_ratio > 0.7:
+                similar_group.append((j, box_j, text_j, analysis_j, lower_j, normalized_j))
+            elif _similar_enough(normalized_i, normalized_j):
+                similar_group.append((j, box_j, text_j, analysis_j, lower_j, normalized_j))
+
+        # Pick the LONGEST one from the group (most complete sentence)
+        # Use the normalized length for comparison
+        best = max(similar_group, key=lambda x: len(x[5]))
+        unique_bubbles.append((best[1], best[2], best[3]))
+
+        # Mark all in this group as used
+        for idx, *_ in similar_group:
+            used_indices.add(idx)
+
+    logger.info("✨ After deduplication: %d unique bubbles", len(unique_bubbles))
+
+    # STEP 3: Generate TTS for unique bubbles. Voices are assigned in reading
+    # order (character voice memory depends on it); the clips are synthesized
+    # concurrently and matched back by position
+    pending: list[tuple[int, list[float], str, str, str | None, str, Future[TTSResult]]] = []
+    for bubble_idx, (bubble_box, normalized_text, analysis) in enumerate(unique_bubbles):
+        cleaned_text = _clean_redundant_phrases(normalized_text)
+        tts_ready_text = _humanize_caps_for_tts(cleaned_text)
+        bubble_type = _bubble_kind_from_analysis(analysis)
+
+        character_key = (analysis.character_type or "").strip().lower()
+        reuse_allowed = (
+            processing_mode != "narrate"
+            and character_key
+            and character_key not in {"unknown", "sfx_autodetect"}
+            and bubble_type not in {"sfx", "narration"}
+        )
+        if processing_mode == "narrate":
+            assigned_voice = (
+                "voice_narrator_m" if narrator_gender == "male" else "voice_narrator_f"
+            )
+            stability = 0.7
+            similarity_boost = 0.85
+            speaker_label = "Narrator"
+            style = 0.25
+        else:
+            if reuse_allowed and character_key in character_voice_memory:
+                cached_voice, cached_stability, cached_similarity, cached_style = (
+                    character_voice_memory[character_key]
+                )
+                assigned_voice = cached_voice
+                stability = cached_stability
+                similarity_boost = cached_similarity
+                style = cached_style
+            else:
+                assigned_voice = analysis.voice_suggestion
+                stability = analysis.stability
+                similarity_boost = analysis.similarity_boost
+                style = analysis.style
+                if reuse_allowed and assigned_voice:
+                    character_voice_memory[character_key] = (
+                        assigned_voice,
+                        stability,
+                        similarity_boost,
+                        style,
+                    )
+            speaker_label = (
+                analysis.character_type.replace("_", " ").title()
+                if analysis.character_type
+                else None
+            )
+
+        # Generate TTS with emotion parameters
+        tone_hint = _build_tone_hint(cleaned_text, analysis)
+        delivery_text = _build_tts_delivery_text(tts_ready_text, analysis)
+        clip = tts_pool.submit(
+            tts_service.synthesize,
+            delivery_text,
+            assigned_voice,
+            stability=stability,
+            similarity_boost=similarity_boost,
+            style=style,
+            tone_hint=tone_hint,
+        )
+        pending.append(
+            (bubble_idx, bubble_box, bubble_type, assigned_voice, speaker_label, cleaned_text, clip)
+        )
+
+    items: list[BubbleItem] = []
+    for (
+        bubble_idx,
+        bubble_box,
+        bubble_type,
+        assigned_voice,
+        speaker_label,
+        cleaned_text,
+        clip,
+    ) in pending:
+        tts_result = clip.result()
+        items.append(
+            BubbleItem(
+                bubble_id=f"bubble_{index}_{bubble_idx}",
+                panel_box=[0, 0, page_width, page_height],
+                bubble_box=bubble_box,
+                type=bubble_type,
+                speaker_id=f"{chapter_id[:6]}_speaker_{index}_{bubble_idx}",
+                speaker_name=speaker_label,
+                voice_id=assigned_voice,
+                text=cleaned_text,
+                audio_url=tts_result.audio_url,
+                word_times=[WordTime(**word.model_dump()) for word in tts_result.word_times],
+            )
+        )
+
+    items.sort(key=lambda item: item.bubble_box[1])
+    reading_order = [item.bubble_id for item in items]
+    return PagePayload(
+        page_index=index,
+        image_url=file_info.get("image_url") or "",
+        width=page_width,
+        height=page_height,
+        items=items,
+        reading_order=reading_order,
+    )
+
+
 def _ensure_local_image(file_info: ChapterFile, chapter_id: str, index: int) -> Path:
     path = Path(file_info["path"])
     if path.exists():
@@ -583,8 +778,8 @@ def _ensure_local_image(file_info: ChapterFile, chapter_id: str, index: int) ->
     suffix = Path(file_info.get("filename") or "").suffix or ".png"
     local_path = cache_dir / f"{chapter_id}_{index:04d}{suffix}"
 
-    print(f"📥 Downloading page {index} for chapter {chapter_id} from {image_url}")
-    response = requests.get(image_url, timeout=60)
+    logger.info("📥 Downloading page %d for chapter %s from %s", index, chapter_id, image_url)
+    response = _SESSION.get(image_url, timeout=60)
     response.raise_for_status()
     local_path.write_bytes(response.content)
     return local_path
@@ -2,9 +2,11 @@ from redis import Redis
 from rq import Connection, Queue, Worker
 
 from app.core.config import settings
+from app.core.log import configure_logging
 
 
 def main() -> None:
+    configure_logging()
     redis = Redis.from_url(settings.redis_url)
     with Connection(redis):
         worker = Worker([settings.job_queue_name])
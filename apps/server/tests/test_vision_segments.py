@@ -0,0 +1,49 @@
+from PIL import Image, ImageDraw
+
+from app.services.vision import vision_service
+
+SLICE_WIDTH = 720
+SLICE_HEIGHT = 1200
+
+
+def _strip(captions: list[str | None]) -> Image.Image:
+    """Webtoon-style strip: the same panel art in every slice, captions vary."""
+    page = Image.new("L", (SLICE_WIDTH, SLICE_HEIGHT * len(captions)), 255)
+    draw = ImageDraw.Draw(page)
+    for index, caption in enumerate(captions):
+        top = index * SLICE_HEIGHT
+        draw.rectangle(
+            (40, top + 40, SLICE_WIDTH - 40, top + SLICE_HEIGHT - 40), outline=0, width=6
+        )
+        if caption:
+            draw.text((SLICE_WIDTH // 2 - 20, top + SLICE_HEIGHT // 2), caption, fill=40)
+    return page
+
+
+def _slices(page: Image.Image) -> list[tuple[int, int]]:
+    return [(top, top + SLICE_HEIGHT) for top in range(0, page.height, SLICE_HEIGHT)]
+
+
+def test_slices_differing_only_in_a_small_caption_are_kept():
+    page = _strip(["Run!", "Sun!"])
+
+    kept = vision_service._informative_segments(page, page.height, _slices(page))
+
+    assert kept == [(0, SLICE_HEIGHT), (SLICE_HEIGHT, 2 * SLICE_HEIGHT)]
+
+
+def test_identical_slices_are_dropped():
+    page = _strip(["Run!", "Run!", None])
+
+    kept = vision_service._informative_segments(page, page.height, _slices(page))
+
+    assert kept == [(0, SLICE_HEIGHT), (2 * SLICE_HEIGHT, 3 * SLICE_HEIGHT)]
+
+
+def test_blank_slices_are_dropped():
+    page = Image.new("L", (SLICE_WIDTH, 2 * SLICE_HEIGHT), 255)
+    ImageDraw.Draw(page).text((SLICE_WIDTH // 2, SLICE_HEIGHT // 2), "Hey", fill=0)
+
+    kept = vision_service._informative_segments(page, page.height, _slices(page))
+
+    assert kept == [(0, SLICE_HEIGHT)]
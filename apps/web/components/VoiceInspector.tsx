@@ -2,7 +2,8 @@
 
 import { useMemo, useState } from "react";
 import { useSWRConfig } from "swr";
-import type { PlaybackController } from "@/lib/types";
+import { fetcher } from "@/lib/api";
+import type { JobStatus, PlaybackController } from "@/lib/types";
 import { cn } from "@/lib/utils";
 
 interface Props {
@@ -23,6 +24,23 @@ const voiceOptions = [
   { id: "voice_sfx", label: "FX Voice • Effects" }
 ];
 
+const JOB_POLL_MS = 1500;
+const JOB_TIMEOUT_MS = 10 * 60 * 1000;
+
+// Voice changes are re-synthesized by the worker; resolve once the job is ready
+async function waitForJob(jobId: string) {
+  const deadline = Date.now() + JOB_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    const job: JobStatus = await fetcher(`/api/jobs/${jobId}`);
+    if (job.status === "ready") return;
+    if (job.status === "failed") {
+      throw new Error(job.error ?? "Voice update failed.");
+    }
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_MS));
+  }
+  throw new Error("Voice update is taking longer than expected.");
+}
+
 export default function VoiceInspector({ controller }: Props) {
   const [message, setMessage] = useState<string | null>(null);
   const { mutate } = useSWRConfig();
@@ -55,12 +73,17 @@ export default function VoiceInspector({ controller }: Props) {
     if (currentVoice === newVoice) return;
 
     try {
-      const apiBase = process.env.NEXT_PUBLIC_API_URL ?? "http://localhost:8000";
-      await fetch(`${apiBase}/api/speakers/${speakerId}`, {
-        method: "PATCH",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ voice_id: newVoice })
-      });
+      const result: { status: string; job_id?: string } = await fetcher(
+        `/api/speakers/${speakerId}`,
+        {
+          method: "PATCH",
+          body: JSON.stringify({ voice_id: newVoice })
+        }
+      );
+      if (result.job_id) {
+        setMessage("Re-recording voice…");
+        await waitForJob(result.job_id);
+      }
       if (controller.chapterId) {
         await mutate(`/api/chapters/${controller.chapterId}`);
       }
@@ -37,6 +37,14 @@ export interface ChapterPayload {
   processing_mode: "bring_to_life" | "narrate";
 }
 
+export interface JobStatus {
+  job_id: string;
+  status: "queued" | "processing" | "ready" | "failed";
+  progress: number;
+  chapter_id?: string | null;
+  error?: string | null;
+}
+
 export interface PlaybackController {
   chapterId: string;
   pages: PagePayload[];